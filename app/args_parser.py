@@ -8,42 +8,104 @@ _NestedLookup: TypeAlias = Dict[str, Union[Type[RedisCommand], _Lookup]]
 
 
 _COMMAND_CLASSES: _NestedLookup = {
+    'APPEND': AppendCommand,
+    'BLMOVE': BlmoveCommand,
     'BLPOP': BlpopCommand,
+    'BRPOP': BrpopCommand,
+    'BZPOPMAX': BzpopmaxCommand,
+    'BZPOPMIN': BzpopminCommand,
+    'CLIENT': {
+        'CACHING': ClientCachingCommand,
+        'ID': ClientIdCommand,
+        'TRACKING': ClientTrackingCommand,
+    },
     'CONFIG': {
         'GET': ConfigGetCommand,
     },
+    'DECR': DecrCommand,
+    'DECRBY': DecrbyCommand,
+    'DEL': DelCommand,
     'DISCARD': DiscardCommand,
     'ECHO': EchoCommand,
     'EXEC': ExecCommand,
+    'EXISTS': ExistsCommand,
+    'EXPIRE': ExpireCommand,
+    'EXPIREAT': ExpireatCommand,
+    'FLUSHALL': FlushallCommand,
+    'FLUSHDB': FlushdbCommand,
     'GEOADD': GeoaddCommand,
     'GEOPOS': GeoposCommand,
     'GET': GetCommand,
+    'GETRANGE': GetrangeCommand,
     'INCR': IncrCommand,
+    'INCRBY': IncrbyCommand,
+    'INCRBYFLOAT': IncrbyfloatCommand,
     'INFO': InfoCommand,
     'KEYS': KeysCommand,
+    'LINDEX': LindexCommand,
+    'LINSERT': LinsertCommand,
     'LLEN': LlenCommand,
+    'LMOVE': LmoveCommand,
     'LPOP': LpopCommand,
+    'LPOS': LposCommand,
     'LPUSH': LpushCommand,
     'LRANGE': LrangeCommand,
+    'LREM': LremCommand,
+    'LSET': LsetCommand,
+    'LTRIM': LtrimCommand,
+    'MEMORY': {
+        'STATS': MemoryStatsCommand,
+        'USAGE': MemoryUsageCommand,
+    },
+    'MGET': MgetCommand,
+    'MSET': MsetCommand,
+    'MSETNX': MsetnxCommand,
     'MULTI': MultiCommand,
+    'OBJECT': {
+        'ENCODING': ObjectEncodingCommand,
+    },
+    'PERSIST': PersistCommand,
+    'PEXPIRE': PexpireCommand,
+    'PEXPIREAT': PexpireatCommand,
     'PING': PingCommand,
+    'PSUBSCRIBE': PsubscribeCommand,
     'PSYNC': PsyncCommand,
+    'PTTL': PttlCommand,
     'PUBLISH': PublishCommand,
+    'PUNSUBSCRIBE': PunsubscribeCommand,
     'REPLCONF': ReplconfCommand,
+    'RPOP': RpopCommand,
     'RPUSH': RpushCommand,
+    'SCAN': ScanCommand,
     'SET': SetCommand,
+    'SETRANGE': SetrangeCommand,
+    'STRLEN': StrlenCommand,
     'SUBSCRIBE': SubscribeCommand,
+    'TTL': TtlCommand,
     'TYPE': TypeCommand,
+    'UNLINK': UnlinkCommand,
     'UNSUBSCRIBE': UnsubscribeCommand,
     'WAIT': WaitCommand,
     'XADD': XaddCommand,
+    'XLEN': XlenCommand,
     'XRANGE': XrangeCommand,
     'XREAD': XreadCommand,
     'ZADD': ZaddCommand,
     'ZCARD': ZcardCommand,
+    'ZCOUNT': ZcountCommand,
+    'ZINCRBY': ZincrbyCommand,
+    'ZLEXCOUNT': ZlexcountCommand,
+    'ZPOPMAX': ZpopmaxCommand,
+    'ZPOPMIN': ZpopminCommand,
     'ZRANGE': ZrangeCommand,
+    'ZRANGEBYLEX': ZrangebylexCommand,
+    'ZRANGEBYSCORE': ZrangebyscoreCommand,
     'ZRANK': ZrankCommand,
     'ZREM': ZremCommand,
+    'ZREMRANGEBYRANK': ZremrangebyrankCommand,
+    'ZREMRANGEBYSCORE': ZremrangebyscoreCommand,
+    'ZREVRANGE': ZrevrangeCommand,
+    'ZREVRANGEBYSCORE': ZrevrangebyscoreCommand,
     'ZSCORE': ZscoreCommand,
 }
 
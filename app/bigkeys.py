@@ -0,0 +1,108 @@
+__all__ = 'find_big_keys',
+
+
+import asyncio
+from typing import Any, Dict, List, Tuple
+
+from .protocol import RespArray, RespBulkString, RespParser, RespValue
+
+
+_SIZE_COMMANDS: Dict[str, Tuple[bytes, str]] = {
+    'string': (b'STRLEN', 'bytes'),
+    'list': (b'LLEN', 'items'),
+    'zset': (b'ZCARD', 'members'),
+    'stream': (b'XLEN', 'entries'),
+}
+
+_SCAN_COUNT = b'100'
+_READ_SIZE = 64 * 1024
+
+
+class _Client:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._reader = reader
+        self._writer = writer
+        self._parser = RespParser()
+        self._replies: List[RespValue] = []
+
+    @classmethod
+    async def connect(cls, host: str, port: int) -> '_Client':
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def call(self, commands: List[List[bytes]]) -> List[Any]:
+        self._writer.write(b''.join(RespArray([RespBulkString(arg) for arg in c]).encode() for c in commands))
+        await self._writer.drain()
+
+        while len(self._replies) < len(commands):
+            data = await self._reader.read(_READ_SIZE)
+            if not data:
+                raise ConnectionError('server closed the connection')
+            self._parser.feed(data)
+            self._replies += self._parser.parse()
+
+        replies, self._replies = self._replies[:len(commands)], self._replies[len(commands):]
+        return [r.to_builtin() for r in replies]
+
+    async def close(self) -> None:
+        self._writer.close()
+        await self._writer.wait_closed()
+
+
+async def find_big_keys(host: str, port: int, by_memory: bool = False) -> None:
+    client = await _Client.connect(host, port)
+    stats, = await client.call([[b'MEMORY', b'STATS']])
+    total_keys = dict(zip(stats[::2], stats[1::2]))[b'keys.count']
+
+    biggest: Dict[str, Tuple[bytes, int]] = {}
+    totals: Dict[str, List[int]] = {t: [0, 0] for t in _SIZE_COMMANDS}
+    sampled = 0
+
+    print('# Scanning the entire keyspace to find biggest keys as well as')
+    print('# average sizes per key type.')
+    print()
+
+    cursor = b'0'
+    while True:
+        (cursor, keys), = await client.call([[b'SCAN', cursor, b'COUNT', _SCAN_COUNT]])
+        types = await client.call([[b'TYPE', key] for key in keys]) if keys else []
+        live = [(key, t) for key, t in zip(keys, types) if t in _SIZE_COMMANDS]
+
+        if by_memory:
+            sizes = await client.call([[b'MEMORY', b'USAGE', key] for key, _ in live])
+        else:
+            sizes = await client.call([[_SIZE_COMMANDS[t][0], key] for key, t in live])
+
+        for (key, t), size in zip(live, sizes):
+            if size is None:
+                continue
+
+            sampled += 1
+            totals[t][0] += 1
+            totals[t][1] += size
+            if t not in biggest or size > biggest[t][1]:
+                biggest[t] = key, size
+                progress = 100 * sampled / max(total_keys, sampled)
+                print(f'[{progress:05.2f}%] Biggest {t:<6} found so far {key!r} with {size} {_unit(t, by_memory)}')
+
+        if cursor == b'0':
+            break
+
+    await client.close()
+
+    print()
+    print('-------- summary -------')
+    print()
+    print(f'Sampled {sampled} keys in the keyspace!')
+    for t, (key, size) in biggest.items():
+        print(f'Biggest {t:>6} found {key!r} has {size} {_unit(t, by_memory)}')
+    print()
+    for t, (count, size) in totals.items():
+        share = 100 * count / sampled if sampled else 0.0
+        avg = size / count if count else 0.0
+        unit = _unit(t, by_memory)
+        print(f'{count} {t}s with {size} {unit} ({share:05.2f}% of keys, avg size {avg:.2f})')
+
+
+def _unit(value_type: str, by_memory: bool) -> str:
+    return 'bytes' if by_memory else _SIZE_COMMANDS[value_type][1]
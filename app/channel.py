@@ -2,31 +2,68 @@ from collections import defaultdict
 from typing import Set
 
 from .connection import RedisConnection
-from .protocol import RespArray, RespBulkString
+from .glob import compile_glob
+from .protocol import RespArray, RespBulkString, RespValue
 
 
 _channels = defaultdict[str, Set[RedisConnection]](set)
+_patterns = defaultdict[str, Set[RedisConnection]](set)
 
 
 def count_subbed_channels(conn: RedisConnection) -> int:
-    return sum(1 for conns in _channels.values() if conn in conns)
-
-
-def count_subscribers(channel: str) -> int:
-    return len(_channels[channel])
+    return (sum(1 for conns in _channels.values() if conn in conns) +
+            sum(1 for conns in _patterns.values() if conn in conns))
 
 
 def has_subbed(conn: RedisConnection) -> bool:
     return count_subbed_channels(conn) > 0
 
 
-async def publish(channel: str, message: str) -> None:
+async def publish(channel: str, message: str) -> int:
+    receivers = 0
     for conn in _channels[channel]:
         await conn.write_resp(RespArray([
             RespBulkString('message'),
             RespBulkString(channel),
             RespBulkString(message),
         ]))
+        receivers += 1
+
+    for pattern, conns in list(_patterns.items()):
+        if not conns or not compile_glob(pattern.encode()).match(channel.encode()):
+            continue
+
+        for conn in conns:
+            await conn.write_resp(RespArray([
+                RespBulkString('pmessage'),
+                RespBulkString(pattern),
+                RespBulkString(channel),
+                RespBulkString(message),
+            ]))
+            receivers += 1
+
+    return receivers
+
+
+def psubscribe(conn: RedisConnection, pattern: str) -> None:
+    _patterns[pattern].add(conn)
+
+
+def punsubscribe(conn: RedisConnection, pattern: str) -> None:
+    _patterns[pattern].discard(conn)
+
+
+def send_message(conn: RedisConnection, channel: str, message: RespValue) -> bool:
+    if conn not in _channels.get(channel, ()):
+        return False
+
+    conn.send_resp(RespArray([
+        RespBulkString('message'),
+        RespBulkString(channel),
+        message,
+    ]))
+    conn.flush_nowait()
+    return True
 
 
 def subscribe(conn: RedisConnection, channel: str) -> None:
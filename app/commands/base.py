@@ -13,6 +13,15 @@ class RedisCommand(ABC):
     async def execute(self, conn: RedisConnection) -> RespValue:
         raise NotImplementedError
 
+    def is_blocking(self) -> bool:
+        return False
+
+    def is_denyoom(self) -> bool:
+        return False
+
+    def is_read_only(self) -> bool:
+        return False
+
     def is_write_command(self) -> bool:
         return False
 
@@ -1,16 +1,99 @@
-__all__ = 'EchoCommand', 'PingCommand'
+__all__ = 'ClientCachingCommand', 'ClientIdCommand', 'ClientTrackingCommand', 'EchoCommand', 'PingCommand'
 
 
 from dataclasses import dataclass
-from typing import List, Self
+from typing import List, Optional, Self
 
 from ..channel import has_subbed
-from ..connection import RedisConnection
+from ..connection import RedisConnection, get_connection
 from ..protocol import *
 
 from .base import RedisCommand
 
 
+@dataclass(frozen=True)
+class ClientCachingCommand(RedisCommand):
+    caching: bool
+
+    async def execute(self, conn: RedisConnection) -> RespValue:
+        if not conn.server.tracking.set_caching(conn, self.caching):
+            return RespSimpleError('ERR CLIENT CACHING can be called only when the client is in tracking mode '
+                                   'with OPTIN or OPTOUT mode enabled')
+        return RespOk
+
+    @classmethod
+    def from_args(cls, args: List[bytes]) -> Self:
+        if len(args) != 1 or args[0].upper() not in (b'YES', b'NO'):
+            raise RuntimeError('CLIENT CACHING command syntax: CLIENT CACHING <YES | NO>')
+        return cls(caching=args[0].upper() == b'YES')
+
+
+@dataclass(frozen=True)
+class ClientIdCommand(RedisCommand):
+    async def execute(self, conn: RedisConnection) -> RespValue:
+        return resp_integer(conn.id)
+
+    @classmethod
+    def from_args(cls, args: List[bytes]) -> Self:
+        if args:
+            raise RuntimeError('CLIENT ID command syntax: CLIENT ID')
+        return cls()
+
+
+@dataclass(frozen=True)
+class ClientTrackingCommand(RedisCommand):
+    on: bool
+    prefixes: List[bytes]
+    redirect: Optional[int] = None
+    bcast: bool = False
+    optin: bool = False
+    optout: bool = False
+
+    async def execute(self, conn: RedisConnection) -> RespValue:
+        tracking = conn.server.tracking
+        if not self.on:
+            tracking.disable(conn)
+            return RespOk
+
+        if self.optin and self.optout:
+            return RespSimpleError('ERR You can\'t use both OPTIN and OPTOUT')
+        elif self.bcast and (self.optin or self.optout):
+            return RespSimpleError('ERR OPTIN and OPTOUT are not compatible with BCAST')
+        elif self.prefixes and not self.bcast:
+            return RespSimpleError('ERR PREFIX option requires BCAST mode to be enabled')
+
+        target = conn if self.redirect is None else get_connection(self.redirect)
+        if target is None:
+            return RespSimpleError('ERR The client ID you want redirect to does not exist')
+
+        tracking.enable(conn, target, bcast=self.bcast, prefixes=self.prefixes, optin=self.optin, optout=self.optout)
+        return RespOk
+
+    @classmethod
+    def from_args(cls, args: List[bytes]) -> Self:
+        syntax = ('CLIENT TRACKING command syntax: CLIENT TRACKING <ON | OFF> [REDIRECT client-id] '
+                  '[PREFIX prefix [PREFIX prefix ...]] [BCAST] [OPTIN] [OPTOUT]')
+        if not args or args[0].upper() not in (b'ON', b'OFF'):
+            raise RuntimeError(syntax)
+
+        kwargs = {'on': args[0].upper() == b'ON', 'prefixes': []}
+        i = 1
+        while i < len(args):
+            option = args[i].upper()
+            if option in (b'BCAST', b'OPTIN', b'OPTOUT'):
+                kwargs[option.decode().lower()] = True
+                i += 1
+            elif option in (b'PREFIX', b'REDIRECT') and i + 1 < len(args):
+                if option == b'PREFIX':
+                    kwargs['prefixes'].append(args[i + 1])
+                else:
+                    kwargs['redirect'] = int(args[i + 1])
+                i += 2
+            else:
+                raise RuntimeError(syntax)
+        return cls(**kwargs)
+
+
 @dataclass(frozen=True)
 class EchoCommand(RedisCommand):
     message: str
@@ -29,7 +112,7 @@ class EchoCommand(RedisCommand):
 class PingCommand(RedisCommand):
     async def execute(self, conn: RedisConnection) -> RespValue:
         if not has_subbed(conn):
-            return RespSimpleString('PONG')
+            return RespPong
         return RespArray([RespBulkString('pong'), RespBulkString('')])
 
     def to_resp_array(self) -> RespArray:
@@ -1,26 +1,159 @@
-__all__ = ('KeysCommand', 'TypeCommand', 'WaitCommand')
+__all__ = ('DelCommand', 'ExistsCommand', 'ExpireCommand', 'ExpireatCommand', 'KeysCommand', 'ObjectEncodingCommand',
+           'PersistCommand', 'PexpireCommand', 'PexpireatCommand', 'PttlCommand', 'ScanCommand', 'TtlCommand', 'TypeCommand',
+           'UnlinkCommand', 'WaitCommand')
 
 
 from dataclasses import dataclass
-from fnmatch import fnmatch
-from typing import List, Optional, Self
+from typing import ClassVar, List, Optional, Self
 
 from ..connection import RedisConnection
 from ..data_structs import *
+from ..database import now_ms
+from ..glob import compile_glob
 from ..protocol import *
 
 from .base import RedisCommand
 
 
+_EXPIRE_CONDITIONS = (b'NX', b'XX', b'GT', b'LT')
+
+_SCAN_DEFAULT_COUNT = 10
+
+
+@dataclass(frozen=True)
+class _DelCommandBase(RedisCommand):
+    NAME: ClassVar[str]
+    LAZY: ClassVar[bool]
+
+    keys: List[bytes]
+
+    async def execute(self, conn: RedisConnection) -> RespValue:
+        database = conn.database
+        return resp_integer(sum(database.delete(key, self.LAZY) for key in self.keys))
+
+    def is_write_command(self) -> bool:
+        return True
+
+    def to_resp_array(self) -> RespArray:
+        return RespArray([RespBulkString(self.NAME), *map(RespBulkString, self.keys)])
+
+    @classmethod
+    def from_args(cls, args: List[bytes]) -> Self:
+        if not args:
+            raise RuntimeError(f'{cls.NAME} command syntax: {cls.NAME} key [key ...]')
+        return cls(keys=args)
+
+
+@dataclass(frozen=True)
+class DelCommand(_DelCommandBase):
+    NAME = 'DEL'
+    LAZY = False
+
+
+@dataclass(frozen=True)
+class ExistsCommand(RedisCommand):
+    keys: List[bytes]
+
+    async def execute(self, conn: RedisConnection) -> RespValue:
+        database = conn.database
+        return resp_integer(sum(database.exists(key) for key in self.keys))
+
+    def is_read_only(self) -> bool:
+        return True
+
+    @classmethod
+    def from_args(cls, args: List[bytes]) -> Self:
+        if not args:
+            raise RuntimeError('EXISTS command syntax: EXISTS key [key ...]')
+        return cls(keys=args)
+
+
+@dataclass(frozen=True)
+class _ExpireCommandBase(RedisCommand):
+    NAME: ClassVar[str]
+    UNIT: ClassVar[str]
+
+    key: bytes
+    time: int
+    condition: Optional[bytes] = None
+
+    async def execute(self, conn: RedisConnection) -> RespValue:
+        database = conn.database
+        if database.get(self.key) is None:
+            return resp_integer(0)
+
+        when = self._deadline()
+        if not self._condition_holds(database.get_expiry(self.key), when):
+            return resp_integer(0)
+
+        if when <= now_ms():
+            database.delete(self.key)
+        else:
+            database.set_expiry(self.key, when)
+        database.signal_modified(self.key)
+        return resp_integer(1)
+
+    def is_write_command(self) -> bool:
+        return True
+
+    def to_resp_array(self) -> RespArray:
+        bulk_strs = [RespBulkString('PEXPIREAT'), RespBulkString(self.key), RespBulkString(str(self._deadline()))]
+        if self.condition is not None:
+            bulk_strs.append(RespBulkString(self.condition))
+        return RespArray(bulk_strs)
+
+    def _condition_holds(self, current: Optional[int], when: int) -> bool:
+        if self.condition == b'NX':
+            return current is None
+        elif self.condition == b'XX':
+            return current is not None
+        elif self.condition == b'GT':
+            return current is not None and when > current
+        elif self.condition == b'LT':
+            return current is None or when < current
+        return True
+
+    def _deadline(self) -> int:
+        raise NotImplementedError
+
+    @classmethod
+    def from_args(cls, args: List[bytes]) -> Self:
+        if len(args) == 2:
+            return cls(key=args[0], time=int(args[1]))
+        elif len(args) == 3 and args[2].upper() in _EXPIRE_CONDITIONS:
+            return cls(key=args[0], time=int(args[1]), condition=args[2].upper())
+        raise RuntimeError(f'{cls.NAME} command syntax: {cls.NAME} key {cls.UNIT} [NX | XX | GT | LT]')
+
+
+@dataclass(frozen=True)
+class ExpireCommand(_ExpireCommandBase):
+    NAME = 'EXPIRE'
+    UNIT = 'seconds'
+
+    def _deadline(self) -> int:
+        return now_ms() + self.time * 1000
+
+
+@dataclass(frozen=True)
+class ExpireatCommand(_ExpireCommandBase):
+    NAME = 'EXPIREAT'
+    UNIT = 'unix-time-seconds'
+
+    def _deadline(self) -> int:
+        return self.time * 1000
+
+
 @dataclass(frozen=True)
 class KeysCommand(RedisCommand):
     pattern: bytes
 
     async def execute(self, conn: RedisConnection) -> RespValue:
         database = conn.database
-        async with database.lock:
-            matching_keys = [k for k in database.keys() if fnmatch(k, self.pattern)]
-            return RespArray([RespBulkString(k) for k in matching_keys])
+        glob = compile_glob(self.pattern)
+        keys = database.keys(glob.prefix)
+        if not glob.matches_all:
+            keys = [k for k in keys if glob.match(k)]
+        return RespArray([RespBulkString(k) for k in keys])
 
     @classmethod
     def from_args(cls, args: List[bytes]) -> Self:
@@ -29,28 +162,175 @@ class KeysCommand(RedisCommand):
         return cls(pattern=args[0])
 
 
+@dataclass(frozen=True)
+class ObjectEncodingCommand(RedisCommand):
+    key: bytes
+
+    async def execute(self, conn: RedisConnection) -> RespValue:
+        value = conn.database.get(self.key)
+        return RespNullBulkString if value is None else RespBulkString(value.encoding)
+
+    def is_read_only(self) -> bool:
+        return True
+
+    @classmethod
+    def from_args(cls, args: List[bytes]) -> Self:
+        if len(args) != 1:
+            raise RuntimeError('OBJECT ENCODING command syntax: OBJECT ENCODING key')
+        return cls(key=args[0])
+
+
+@dataclass(frozen=True)
+class PersistCommand(RedisCommand):
+    key: bytes
+
+    async def execute(self, conn: RedisConnection) -> RespValue:
+        database = conn.database
+        if database.get(self.key) is None or not database.persist(self.key):
+            return resp_integer(0)
+
+        database.signal_modified(self.key)
+        return resp_integer(1)
+
+    def is_write_command(self) -> bool:
+        return True
+
+    def to_resp_array(self) -> RespArray:
+        return RespArray([RespBulkString('PERSIST'), RespBulkString(self.key)])
+
+    @classmethod
+    def from_args(cls, args: List[bytes]) -> Self:
+        if len(args) != 1:
+            raise RuntimeError('PERSIST command syntax: PERSIST key')
+        return cls(key=args[0])
+
+
+@dataclass(frozen=True)
+class PexpireCommand(_ExpireCommandBase):
+    NAME = 'PEXPIRE'
+    UNIT = 'milliseconds'
+
+    def _deadline(self) -> int:
+        return now_ms() + self.time
+
+
+@dataclass(frozen=True)
+class PexpireatCommand(_ExpireCommandBase):
+    NAME = 'PEXPIREAT'
+    UNIT = 'unix-time-milliseconds'
+
+    def _deadline(self) -> int:
+        return self.time
+
+
+@dataclass(frozen=True)
+class PttlCommand(RedisCommand):
+    key: bytes
+
+    async def execute(self, conn: RedisConnection) -> RespValue:
+        database = conn.database
+        if database.get(self.key) is None:
+            return resp_integer(-2)
+
+        expiry = database.get_expiry(self.key)
+        if expiry is None:
+            return resp_integer(-1)
+        return resp_integer(max(expiry - now_ms(), 0))
+
+    def is_read_only(self) -> bool:
+        return True
+
+    @classmethod
+    def from_args(cls, args: List[bytes]) -> Self:
+        if len(args) != 1:
+            raise RuntimeError('PTTL command syntax: PTTL key')
+        return cls(key=args[0])
+
+
+@dataclass(frozen=True)
+class ScanCommand(RedisCommand):
+    cursor: int
+    pattern: Optional[bytes] = None
+    count: int = _SCAN_DEFAULT_COUNT
+    value_type: Optional[str] = None
+
+    async def execute(self, conn: RedisConnection) -> RespValue:
+        database = conn.database
+        next_cursor, keys = database.scan(self.cursor, self.count)
+        glob = compile_glob(self.pattern) if self.pattern is not None else None
+
+        matching_keys = []
+        for key in keys:
+            if glob is not None and not glob.match(key):
+                continue
+
+            value = database.get(key)
+            if value is None:
+                continue
+
+            if self.value_type is not None and type_name(value) != self.value_type:
+                continue
+
+            matching_keys.append(RespBulkString(key))
+
+        return RespArray([RespBulkString(str(next_cursor)), RespArray(matching_keys)])
+
+    @classmethod
+    def from_args(cls, args: List[bytes]) -> Self:
+        syntax_error = RuntimeError('SCAN command syntax: SCAN cursor [MATCH pattern] [COUNT count] [TYPE type]')
+        if len(args) % 2 != 1:
+            raise syntax_error
+
+        kwargs = {}
+        for option, value in zip(args[1::2], args[2::2]):
+            option = option.upper()
+            if option == b'MATCH':
+                kwargs['pattern'] = value
+            elif option == b'COUNT' and int(value) > 0:
+                kwargs['count'] = int(value)
+            elif option == b'TYPE':
+                kwargs['value_type'] = value.decode().lower()
+            else:
+                raise syntax_error
+
+        return cls(cursor=int(args[0]), **kwargs)
+
+
+@dataclass(frozen=True)
+class TtlCommand(RedisCommand):
+    key: bytes
+
+    async def execute(self, conn: RedisConnection) -> RespValue:
+        database = conn.database
+        if database.get(self.key) is None:
+            return resp_integer(-2)
+
+        expiry = database.get_expiry(self.key)
+        if expiry is None:
+            return resp_integer(-1)
+        return resp_integer(max(expiry - now_ms() + 500, 0) // 1000)
+
+    def is_read_only(self) -> bool:
+        return True
+
+    @classmethod
+    def from_args(cls, args: List[bytes]) -> Self:
+        if len(args) != 1:
+            raise RuntimeError('TTL command syntax: TTL key')
+        return cls(key=args[0])
+
+
 @dataclass(frozen=True)
 class TypeCommand(RedisCommand):
     key: bytes
 
     async def execute(self, conn: RedisConnection) -> RespValue:
         database = conn.database
-        async with database.lock:
-            value = database.get(self.key)
-            return RespSimpleString(self._stringify_type(value))
-
-    def _stringify_type(self, value: Optional[RedisDataStruct]) -> str:
-        if value is None:
-            return 'none'
-
-        if isinstance(value, RedisList):
-            return 'list'
-        elif isinstance(value, RedisSortedSet):
-            return 'zset'
-        elif isinstance(value, RedisStream):
-            return 'stream'
-        else:
-            return 'string'
+        value = database.get(self.key)
+        return RespSimpleString(type_name(value))
+
+    def is_read_only(self) -> bool:
+        return True
 
     @classmethod
     def from_args(cls, args: List[bytes]) -> Self:
@@ -59,13 +339,22 @@ class TypeCommand(RedisCommand):
         return cls(key=args[0])
 
 
+@dataclass(frozen=True)
+class UnlinkCommand(_DelCommandBase):
+    NAME = 'UNLINK'
+    LAZY = True
+
+
 @dataclass(frozen=True)
 class WaitCommand(RedisCommand):
     num_replicas: int
     timeout: int
 
     async def execute(self, conn: RedisConnection) -> RespValue:
-        return RespInteger(await conn.server.wait(self.num_replicas, self.timeout))
+        return resp_integer(await conn.server.wait(self.num_replicas, self.timeout))
+
+    def is_blocking(self) -> bool:
+        return True
 
     @classmethod
     def from_args(cls, args: List[bytes]) -> Self:
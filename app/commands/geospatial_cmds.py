@@ -29,6 +29,9 @@ class GeoaddCommand(RedisCommand):
             score_member_pairs=[(score, self.member)],
         ).execute(conn)
 
+    def is_denyoom(self) -> bool:
+        return True
+
     @classmethod
     def from_args(cls, args: List[bytes]) -> Self:
         if len(args) != 4:
@@ -58,6 +61,9 @@ class GeoposCommand(RedisCommand):
         longitude, latitude = compute_location(score)
         return RespArray([RespBulkString(str(longitude)), RespBulkString(str(latitude))])
 
+    def is_read_only(self) -> bool:
+        return True
+
     @classmethod
     def from_args(cls, args: List[bytes]) -> Self:
         if len(args) < 2:
@@ -1,50 +1,253 @@
 __all__ = (
+    'BlmoveCommand',
     'BlpopCommand',
+    'BrpopCommand',
+    'LindexCommand',
+    'LinsertCommand',
     'LlenCommand',
+    'LmoveCommand',
     'LpopCommand',
+    'LposCommand',
     'LpushCommand',
     'LrangeCommand',
+    'LremCommand',
+    'LsetCommand',
+    'LtrimCommand',
+    'RpopCommand',
     'RpushCommand',
 )
 
 
 from dataclasses import dataclass
-from typing import List, Optional, Self
+from functools import partial
+from typing import ClassVar, List, Optional, Self, Union
 
 from ..connection import RedisConnection
-from ..data_structs import RedisDataStruct, RedisList
+from ..data_structs import RedisList
+from ..database import RedisDatabase
 from ..protocol import *
 
 from .base import RedisCommand
 
 
-def _blpop_predicate(value: RedisDataStruct) -> bool:
-    return isinstance(value, RedisList) and bool(value)
+_SIDES = {b'LEFT': True, b'RIGHT': False}
+
+
+def _parse_side(arg: bytes) -> bool:
+    side = _SIDES.get(arg.upper())
+    if side is None:
+        raise RuntimeError(f'Invalid list side: {arg.decode()}')
+    return side
+
+
+def _pop(database: RedisDatabase, key: bytes, lst: RedisList, left: bool, count: Optional[int] = None) -> Union[bytes, List[bytes]]:
+    popped = lst.lpop(count) if left else lst.rpop(count)
+    if not lst:
+        database.delete(key)
+    else:
+        database.signal_modified(key)
+    return popped
+
+
+def _push(database: RedisDatabase, key: bytes, elements: List[bytes], left: bool) -> int:
+    lst = database.setdefault(key, RedisList())
+    if not isinstance(lst, RedisList):
+        raise RuntimeError('WRONGTYPE')
+
+    if left:
+        lst.lpush(elements)
+    else:
+        lst.rpush(elements)
+    length = len(lst)
+    database.signal_modified(key)
+    database.notify(key)
+    return length
+
+
+def _move(database: RedisDatabase, source: bytes, destination: bytes, from_left: bool, to_left: bool) -> Optional[bytes]:
+    lst = database.get(source)
+    if lst is None:
+        return None
+
+    dst = database.get(destination)
+    if not isinstance(lst, RedisList) or (dst is not None and not isinstance(dst, RedisList)):
+        raise RuntimeError('WRONGTYPE')
+
+    if source == destination:
+        element = lst.lpop() if from_left else lst.rpop()
+        if to_left:
+            lst.lpush([element])
+        else:
+            lst.rpush([element])
+        database.signal_modified(source)
+        return element
+
+    element = _pop(database, source, lst, from_left)
+    _push(database, destination, [element], to_left)
+    return element
 
 
 @dataclass(frozen=True)
-class BlpopCommand(RedisCommand):
-    key: bytes
+class BlmoveCommand(RedisCommand):
+    source: bytes
+    destination: bytes
+    from_left: bool
+    to_left: bool
+    timeout: float
+
+    async def execute(self, conn: RedisConnection) -> RespValue:
+        database = conn.database
+        element = _move(database, self.source, self.destination, self.from_left, self.to_left)
+        if element is not None:
+            return RespBulkString(element)
+
+        if conn.transaction.executing:
+            return RespNullBulkString
+
+        response = await database.wait_for([self.source], partial(self._serve, database), timeout=self.timeout)
+        return RespNullBulkString if response is None else response
+
+    def is_blocking(self) -> bool:
+        return True
+
+    def is_denyoom(self) -> bool:
+        return True
+
+    def _serve(self, database: RedisDatabase, key: bytes) -> Optional[RespValue]:
+        if not isinstance(database.get(key), RedisList):
+            return None
+
+        dst = database.get(self.destination)
+        if dst is not None and not isinstance(dst, RedisList):
+            return RespSimpleError('WRONGTYPE Operation against a key holding the wrong kind of value')
+
+        return RespBulkString(_move(database, key, self.destination, self.from_left, self.to_left))
+
+    @classmethod
+    def from_args(cls, args: List[bytes]) -> Self:
+        if len(args) != 5:
+            raise RuntimeError('BLMOVE command syntax: BLMOVE source destination LEFT|RIGHT LEFT|RIGHT timeout')
+        return cls(
+            source=args[0],
+            destination=args[1],
+            from_left=_parse_side(args[2]),
+            to_left=_parse_side(args[3]),
+            timeout=float(args[4]),
+        )
+
+
+@dataclass(frozen=True)
+class _BlockingPopCommandBase(RedisCommand):
+    NAME: ClassVar[str]
+    LEFT: ClassVar[bool]
+
+    keys: List[bytes]
     timeout: float
 
     async def execute(self, conn: RedisConnection) -> RespValue:
         database = conn.database
-        async with database.lock:
-            lst = await database.wait_for(self.key, _blpop_predicate, timeout=self.timeout)
+        for key in self.keys:
+            lst = database.get(key)
             if lst is None:
-                return RespNullArray
+                continue
 
-            popped = lst.lpop()
-            if not lst:
-                database.delete(self.key)
+            if not isinstance(lst, RedisList):
+                raise RuntimeError('WRONGTYPE')
+
+            return self._pop(database, key)
+
+        if conn.transaction.executing:
+            return RespNullArray
+
+        response = await database.wait_for(self.keys, partial(self._pop, database), timeout=self.timeout)
+        return RespNullArray if response is None else response
+
+    def _pop(self, database: RedisDatabase, key: bytes) -> Optional[RespValue]:
+        lst = database.get(key)
+        if not isinstance(lst, RedisList) or not lst:
+            return None
 
-            return RespArray([RespBulkString(self.key), RespBulkString(popped)])
+        popped = _pop(database, key, lst, self.LEFT)
+        return RespArray([RespBulkString(key), RespBulkString(popped)])
+
+    def is_blocking(self) -> bool:
+        return True
+
+    @classmethod
+    def from_args(cls, args: List[bytes]) -> Self:
+        if len(args) < 2:
+            raise RuntimeError(f'{cls.NAME} command syntax: {cls.NAME} key [key ...] timeout')
+        return cls(keys=args[:-1], timeout=float(args[-1]))
+
+
+@dataclass(frozen=True)
+class BlpopCommand(_BlockingPopCommandBase):
+    NAME = 'BLPOP'
+    LEFT = True
+
+
+@dataclass(frozen=True)
+class BrpopCommand(_BlockingPopCommandBase):
+    NAME = 'BRPOP'
+    LEFT = False
+
+
+@dataclass(frozen=True)
+class LindexCommand(RedisCommand):
+    key: bytes
+    index: int
+
+    async def execute(self, conn: RedisConnection) -> RespValue:
+        database = conn.database
+        lst = database.get(self.key)
+        if lst is None:
+            return RespNullBulkString
+
+        if not isinstance(lst, RedisList):
+            raise RuntimeError('WRONGTYPE')
+
+        element = lst.get(self.index)
+        return RespNullBulkString if element is None else RespBulkString(element)
+
+    def is_read_only(self) -> bool:
+        return True
 
     @classmethod
     def from_args(cls, args: List[bytes]) -> Self:
         if len(args) != 2:
-            raise RuntimeError('BLPOP command syntax: BLPOP key timeout')
-        return cls(key=args[0], timeout=float(args[1]))
+            raise RuntimeError('LINDEX command syntax: LINDEX key index')
+        return cls(key=args[0], index=int(args[1]))
+
+
+@dataclass(frozen=True)
+class LinsertCommand(RedisCommand):
+    key: bytes
+    after: bool
+    pivot: bytes
+    element: bytes
+
+    async def execute(self, conn: RedisConnection) -> RespValue:
+        database = conn.database
+        lst = database.get(self.key)
+        if lst is None:
+            return resp_integer(0)
+
+        if not isinstance(lst, RedisList):
+            raise RuntimeError('WRONGTYPE')
+
+        length = lst.insert(self.pivot, self.element, after=self.after)
+        if length > 0:
+            database.signal_modified(self.key)
+        return resp_integer(length)
+
+    def is_denyoom(self) -> bool:
+        return True
+
+    @classmethod
+    def from_args(cls, args: List[bytes]) -> Self:
+        if len(args) != 4 or args[1].upper() not in (b'BEFORE', b'AFTER'):
+            raise RuntimeError('LINSERT command syntax: LINSERT key BEFORE|AFTER pivot element')
+        return cls(key=args[0], after=args[1].upper() == b'AFTER', pivot=args[2], element=args[3])
 
 
 @dataclass(frozen=True)
@@ -53,15 +256,17 @@ class LlenCommand(RedisCommand):
 
     async def execute(self, conn: RedisConnection) -> RespValue:
         database = conn.database
-        async with database.lock:
-            lst = database.get(self.key)
-            if lst is None:
-                return RespInteger(0)
+        lst = database.get(self.key)
+        if lst is None:
+            return resp_integer(0)
 
-            if not isinstance(lst, RedisList):
-                raise RuntimeError('WRONGTYPE')
+        if not isinstance(lst, RedisList):
+            raise RuntimeError('WRONGTYPE')
+
+        return resp_integer(len(lst))
 
-            return RespInteger(len(lst))
+    def is_read_only(self) -> bool:
+        return True
 
     @classmethod
     def from_args(cls, args: List[bytes]) -> Self:
@@ -71,27 +276,52 @@ class LlenCommand(RedisCommand):
 
 
 @dataclass(frozen=True)
-class LpopCommand(RedisCommand):
+class LmoveCommand(RedisCommand):
+    source: bytes
+    destination: bytes
+    from_left: bool
+    to_left: bool
+
+    async def execute(self, conn: RedisConnection) -> RespValue:
+        element = _move(conn.database, self.source, self.destination, self.from_left, self.to_left)
+        return RespNullBulkString if element is None else RespBulkString(element)
+
+    def is_denyoom(self) -> bool:
+        return True
+
+    @classmethod
+    def from_args(cls, args: List[bytes]) -> Self:
+        if len(args) != 4:
+            raise RuntimeError('LMOVE command syntax: LMOVE source destination LEFT|RIGHT LEFT|RIGHT')
+        return cls(
+            source=args[0],
+            destination=args[1],
+            from_left=_parse_side(args[2]),
+            to_left=_parse_side(args[3]),
+        )
+
+
+@dataclass(frozen=True)
+class _PopCommandBase(RedisCommand):
+    NAME: ClassVar[str]
+    LEFT: ClassVar[bool]
+
     key: bytes
     count: Optional[int] = None
 
     async def execute(self, conn: RedisConnection) -> RespValue:
         database = conn.database
-        async with database.lock:
-            lst = database.get(self.key)
-            if lst is None:
-                return RespNullBulkString
-
-            if not isinstance(lst, RedisList):
-                raise RuntimeError('WRONGTYPE')
+        lst = database.get(self.key)
+        if lst is None:
+            return RespNullBulkString
 
-            popped = lst.lpop(self.count)
-            if not lst:
-                database.delete(self.key)
+        if not isinstance(lst, RedisList):
+            raise RuntimeError('WRONGTYPE')
 
-            if isinstance(popped, list):
-                return RespArray([RespBulkString(e) for e in popped])
-            return RespBulkString(popped)
+        popped = _pop(database, self.key, lst, self.LEFT, self.count)
+        if isinstance(popped, list):
+            return RespArray([RespBulkString(e) for e in popped])
+        return RespBulkString(popped)
 
     @classmethod
     def from_args(cls, args: List[bytes]) -> Self:
@@ -99,7 +329,58 @@ class LpopCommand(RedisCommand):
             return cls(key=args[0])
         elif len(args) == 2:
             return cls(key=args[0], count=int(args[1]))
-        raise RuntimeError('LPOP command syntax: LPOP key [count]')
+        raise RuntimeError(f'{cls.NAME} command syntax: {cls.NAME} key [count]')
+
+
+@dataclass(frozen=True)
+class LpopCommand(_PopCommandBase):
+    NAME = 'LPOP'
+    LEFT = True
+
+
+@dataclass(frozen=True)
+class LposCommand(RedisCommand):
+    key: bytes
+    element: bytes
+    rank: int = 1
+    count: Optional[int] = None
+    maxlen: int = 0
+
+    async def execute(self, conn: RedisConnection) -> RespValue:
+        database = conn.database
+        lst = database.get(self.key)
+        if lst is not None and not isinstance(lst, RedisList):
+            raise RuntimeError('WRONGTYPE')
+
+        count = 1 if self.count is None else self.count
+        positions = lst.positions(self.element, rank=self.rank, count=count, maxlen=self.maxlen) if lst is not None else []
+
+        if self.count is not None:
+            return RespArray([resp_integer(p) for p in positions])
+        return resp_integer(positions[0]) if positions else RespNullBulkString
+
+    def is_read_only(self) -> bool:
+        return True
+
+    @classmethod
+    def from_args(cls, args: List[bytes]) -> Self:
+        syntax_error = RuntimeError('LPOS command syntax: LPOS key element [RANK rank] [COUNT num-matches] [MAXLEN len]')
+        if len(args) < 2 or len(args) % 2 != 0:
+            raise syntax_error
+
+        kwargs = {}
+        for option, value in zip(args[2::2], args[3::2]):
+            option = option.upper()
+            if option == b'RANK' and int(value) != 0:
+                kwargs['rank'] = int(value)
+            elif option == b'COUNT' and int(value) >= 0:
+                kwargs['count'] = int(value)
+            elif option == b'MAXLEN' and int(value) >= 0:
+                kwargs['maxlen'] = int(value)
+            else:
+                raise syntax_error
+
+        return cls(key=args[0], element=args[1], **kwargs)
 
 
 @dataclass(frozen=True)
@@ -108,15 +389,10 @@ class LpushCommand(RedisCommand):
     elements: List[bytes]
 
     async def execute(self, conn: RedisConnection) -> RespValue:
-        database = conn.database
-        async with database.lock:
-            lst = database.setdefault(self.key, RedisList())
-            if not isinstance(lst, RedisList):
-                raise RuntimeError('WRONGTYPE')
+        return resp_integer(_push(conn.database, self.key, self.elements, left=True))
 
-            lst.lpush(self.elements)
-            database.notify(self.key)
-            return RespInteger(len(lst))
+    def is_denyoom(self) -> bool:
+        return True
 
     @classmethod
     def from_args(cls, args: List[bytes]) -> Self:
@@ -133,16 +409,18 @@ class LrangeCommand(RedisCommand):
 
     async def execute(self, conn: RedisConnection) -> RespValue:
         database = conn.database
-        async with database.lock:
-            lst = database.get(self.key)
-            if lst is None:
-                return RespArray([])
+        lst = database.get(self.key)
+        if lst is None:
+            return RespEmptyArray
 
-            if not isinstance(lst, RedisList):
-                raise RuntimeError('WRONGTYPE')
+        if not isinstance(lst, RedisList):
+            raise RuntimeError('WRONGTYPE')
 
-            elements = lst.get_range(self.start, self.stop)
-            return RespArray([RespBulkString(e) for e in elements])
+        elements = lst.get_range(self.start, self.stop)
+        return RespArray([RespBulkString(e) for e in elements])
+
+    def is_read_only(self) -> bool:
+        return True
 
     @classmethod
     def from_args(cls, args: List[bytes]) -> Self:
@@ -151,21 +429,111 @@ class LrangeCommand(RedisCommand):
         return cls(key=args[0], start=int(args[1]), stop=int(args[2]))
 
 
+@dataclass(frozen=True)
+class LremCommand(RedisCommand):
+    key: bytes
+    count: int
+    element: bytes
+
+    async def execute(self, conn: RedisConnection) -> RespValue:
+        database = conn.database
+        lst = database.get(self.key)
+        if lst is None:
+            return resp_integer(0)
+
+        if not isinstance(lst, RedisList):
+            raise RuntimeError('WRONGTYPE')
+
+        removed = lst.remove(self.element, self.count)
+        if not lst:
+            database.delete(self.key)
+        elif removed:
+            database.signal_modified(self.key)
+        return resp_integer(removed)
+
+    @classmethod
+    def from_args(cls, args: List[bytes]) -> Self:
+        if len(args) != 3:
+            raise RuntimeError('LREM command syntax: LREM key count element')
+        return cls(key=args[0], count=int(args[1]), element=args[2])
+
+
+@dataclass(frozen=True)
+class LsetCommand(RedisCommand):
+    key: bytes
+    index: int
+    element: bytes
+
+    async def execute(self, conn: RedisConnection) -> RespValue:
+        database = conn.database
+        lst = database.get(self.key)
+        if lst is None:
+            return RespSimpleError('ERR no such key')
+
+        if not isinstance(lst, RedisList):
+            raise RuntimeError('WRONGTYPE')
+
+        if not lst.set(self.index, self.element):
+            return RespSimpleError('ERR index out of range')
+
+        database.signal_modified(self.key)
+        return RespOk
+
+    def is_denyoom(self) -> bool:
+        return True
+
+    @classmethod
+    def from_args(cls, args: List[bytes]) -> Self:
+        if len(args) != 3:
+            raise RuntimeError('LSET command syntax: LSET key index element')
+        return cls(key=args[0], index=int(args[1]), element=args[2])
+
+
+@dataclass(frozen=True)
+class LtrimCommand(RedisCommand):
+    key: bytes
+    start: int
+    stop: int
+
+    async def execute(self, conn: RedisConnection) -> RespValue:
+        database = conn.database
+        lst = database.get(self.key)
+        if lst is None:
+            return RespOk
+
+        if not isinstance(lst, RedisList):
+            raise RuntimeError('WRONGTYPE')
+
+        lst.trim(self.start, self.stop)
+        if not lst:
+            database.delete(self.key)
+        else:
+            database.signal_modified(self.key)
+        return RespOk
+
+    @classmethod
+    def from_args(cls, args: List[bytes]) -> Self:
+        if len(args) != 3:
+            raise RuntimeError('LTRIM command syntax: LTRIM key start stop')
+        return cls(key=args[0], start=int(args[1]), stop=int(args[2]))
+
+
+@dataclass(frozen=True)
+class RpopCommand(_PopCommandBase):
+    NAME = 'RPOP'
+    LEFT = False
+
+
 @dataclass(frozen=True)
 class RpushCommand(RedisCommand):
     key: bytes
     elements: List[bytes]
 
     async def execute(self, conn: RedisConnection) -> RespValue:
-        database = conn.database
-        async with database.lock:
-            lst = database.setdefault(self.key, RedisList())
-            if not isinstance(lst, RedisList):
-                raise RuntimeError('WRONGTYPE')
+        return resp_integer(_push(conn.database, self.key, self.elements, left=False))
 
-            lst.rpush(self.elements)
-            database.notify(self.key)
-            return RespInteger(len(lst))
+    def is_denyoom(self) -> bool:
+        return True
 
     @classmethod
     def from_args(cls, args: List[bytes]) -> Self:
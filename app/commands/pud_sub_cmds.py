@@ -1,24 +1,42 @@
-__all__ = ('PublishCommand', 'SubscribeCommand', 'UnsubscribeCommand')
+__all__ = ('PsubscribeCommand', 'PublishCommand', 'PunsubscribeCommand', 'SubscribeCommand', 'UnsubscribeCommand')
 
 
 from dataclasses import dataclass
 from typing import List, Self
 
-from ..channel import count_subbed_channels, count_subscribers, publish, subscribe, unsubscribe
+from ..channel import count_subbed_channels, psubscribe, publish, punsubscribe, subscribe, unsubscribe
 from ..connection import RedisConnection
 from ..protocol import *
 
 from .base import RedisCommand
 
 
+@dataclass(frozen=True)
+class PsubscribeCommand(RedisCommand):
+    pattern: str
+
+    async def execute(self, conn: RedisConnection) -> RespValue:
+        psubscribe(conn, self.pattern)
+        return RespArray([
+            RespBulkString('psubscribe'),
+            RespBulkString(self.pattern),
+            resp_integer(count_subbed_channels(conn)),
+        ])
+
+    @classmethod
+    def from_args(cls, args: List[bytes]) -> Self:
+        if len(args) != 1:
+            raise RuntimeError('PSUBSCRIBE command syntax: PSUBSCRIBE pattern')
+        return cls(pattern=args[0].decode())
+
+
 @dataclass(frozen=True)
 class PublishCommand(RedisCommand):
     channel: str
     message: str
 
     async def execute(self, conn: RedisConnection) -> RespValue:
-        await publish(self.channel, self.message)
-        return RespInteger(count_subscribers(self.channel))
+        return resp_integer(await publish(self.channel, self.message))
 
     @classmethod
     def from_args(cls, args: List[bytes]) -> Self:
@@ -27,6 +45,25 @@ class PublishCommand(RedisCommand):
         return cls(channel=args[0].decode(), message=args[1].decode())
 
 
+@dataclass(frozen=True)
+class PunsubscribeCommand(RedisCommand):
+    pattern: str
+
+    async def execute(self, conn: RedisConnection) -> RespValue:
+        punsubscribe(conn, self.pattern)
+        return RespArray([
+            RespBulkString('punsubscribe'),
+            RespBulkString(self.pattern),
+            resp_integer(count_subbed_channels(conn)),
+        ])
+
+    @classmethod
+    def from_args(cls, args: List[bytes]) -> Self:
+        if len(args) != 1:
+            raise RuntimeError('PUNSUBSCRIBE command syntax: PUNSUBSCRIBE pattern')
+        return cls(pattern=args[0].decode())
+
+
 @dataclass(frozen=True)
 class SubscribeCommand(RedisCommand):
     channel: str
@@ -36,7 +73,7 @@ class SubscribeCommand(RedisCommand):
         return RespArray([
             RespBulkString('subscribe'),
             RespBulkString(self.channel),
-            RespInteger(count_subbed_channels(conn)),
+            resp_integer(count_subbed_channels(conn)),
         ])
 
     @classmethod
@@ -55,7 +92,7 @@ class UnsubscribeCommand(RedisCommand):
         return RespArray([
             RespBulkString('unsubscribe'),
             RespBulkString(self.channel),
-            RespInteger(count_subbed_channels(conn)),
+            resp_integer(count_subbed_channels(conn)),
         ])
 
     @classmethod
@@ -1,19 +1,27 @@
 __all__ = (
     'ConfigGetCommand',
+    'FlushallCommand',
+    'FlushdbCommand',
     'InfoCommand',
+    'MemoryStatsCommand',
+    'MemoryUsageCommand',
     'PsyncCommand',
     'ReplconfCommand',
 )
 
 
 from dataclasses import dataclass
-from typing import List, Self
+from typing import TYPE_CHECKING, Callable, ClassVar, Dict, List, Optional, Self
 
 from ..connection import RedisConnection
+from ..data_structs import TYPE_NAMES
 from ..protocol import *
 
 from .base import RedisCommand
 
+if TYPE_CHECKING:
+    from ..server import RedisServer
+
 
 @dataclass(frozen=True)
 class ConfigGetCommand(RedisCommand):
@@ -34,23 +42,151 @@ class ConfigGetCommand(RedisCommand):
         return cls(parameters=[arg.decode() for arg in args])
 
 
+@dataclass(frozen=True)
+class _FlushCommandBase(RedisCommand):
+    NAME: ClassVar[str]
+
+    lazy: bool = False
+
+    def is_write_command(self) -> bool:
+        return True
+
+    def to_resp_array(self) -> RespArray:
+        return RespArray([RespBulkString(self.NAME), RespBulkString('ASYNC' if self.lazy else 'SYNC')])
+
+    @classmethod
+    def from_args(cls, args: List[bytes]) -> Self:
+        mode = args[0].upper() if len(args) == 1 else None
+        if len(args) > 1 or args and mode not in (b'ASYNC', b'SYNC'):
+            raise RuntimeError(f'{cls.NAME} command syntax: {cls.NAME} [ASYNC | SYNC]')
+        return cls(lazy=mode == b'ASYNC')
+
+
+@dataclass(frozen=True)
+class FlushallCommand(_FlushCommandBase):
+    NAME = 'FLUSHALL'
+
+    async def execute(self, conn: RedisConnection) -> RespValue:
+        for db in conn.server.databases:
+            db.flush(lazy=self.lazy)
+        return RespOk
+
+
+@dataclass(frozen=True)
+class FlushdbCommand(_FlushCommandBase):
+    NAME = 'FLUSHDB'
+
+    async def execute(self, conn: RedisConnection) -> RespValue:
+        conn.database.flush(lazy=self.lazy)
+        return RespOk
+
+
 @dataclass(frozen=True)
 class InfoCommand(RedisCommand):
-    section: str
+    section: Optional[str] = None
 
     async def execute(self, conn: RedisConnection) -> RespValue:
-        server = conn.server
-        return RespBulkString(
+        sections: Dict[str, Callable[['RedisServer'], str]] = {
+            'memory': self._memory,
+            'replication': self._replication,
+            'stats': self._stats,
+        }
+
+        if self.section is None or self.section in ('all', 'default', 'everything'):
+            names = list(sections)
+        elif self.section in sections:
+            names = [self.section]
+        else:
+            names = []
+
+        return RespBulkString('\r\n\r\n'.join(sections[name](conn.server) for name in names))
+
+    @staticmethod
+    def _memory(server: 'RedisServer') -> str:
+        return (
+            '# Memory\r\n'
+            f'used_memory:{server.used_memory}\r\n'
+            f'maxmemory:{server.maxmemory}\r\n'
+            f'maxmemory_policy:{server.maxmemory_policy}\r\n'
+            f'lazyfree_pending_objects:{server.lazyfree_pending_objects}\r\n'
+            f'lazyfreed_objects:{server.lazyfreed_objects}'
+        )
+
+    @staticmethod
+    def _replication(server: 'RedisServer') -> str:
+        return (
+            '# Replication\r\n'
             f'role:{server.role}\r\n'
             f'master_replid:{server.replication_id}\r\n'
             f'master_repl_offset:{server.replication_offset}'
         )
 
+    @staticmethod
+    def _stats(server: 'RedisServer') -> str:
+        return (
+            '# Stats\r\n'
+            f'expired_keys:{server.expired_keys}\r\n'
+            f'evicted_keys:{server.evicted_keys}\r\n'
+            f'expire_cycle_cpu_milliseconds:{server.expire_cycle_time_us // 1000}\r\n'
+            f'expire_cycle_last_duration_us:{server.expire_cycle_last_us}\r\n'
+            f'tracking_clients:{server.tracking.num_clients}\r\n'
+            f'tracking_total_keys:{server.tracking.num_keys}\r\n'
+            f'tracking_total_prefixes:{server.tracking.num_prefixes}'
+        )
+
+    @classmethod
+    def from_args(cls, args: List[bytes]) -> Self:
+        if len(args) > 1:
+            raise RuntimeError('INFO command syntax: INFO [section]')
+        return cls(section=args[0].decode().lower() if args else None)
+
+
+@dataclass(frozen=True)
+class MemoryStatsCommand(RedisCommand):
+    async def execute(self, conn: RedisConnection) -> RespValue:
+        server = conn.server
+        totals = {t: [0, 0] for t in TYPE_NAMES}
+        for db in server.databases:
+            for t, (keys, nbytes) in db.memory_stats().items():
+                totals[t][0] += keys
+                totals[t][1] += nbytes
+
+        stats = [
+            ('keys.count', sum(keys for keys, _ in totals.values())),
+            ('dataset.bytes', server.used_memory),
+            ('maxmemory', server.maxmemory),
+        ]
+        for t, (keys, nbytes) in totals.items():
+            stats += [(f'{TYPE_NAMES[t]}.keys', keys), (f'{TYPE_NAMES[t]}.bytes', nbytes)]
+
+        return RespArray([v for name, value in stats for v in (RespBulkString(name), resp_integer(value))])
+
+    @classmethod
+    def from_args(cls, args: List[bytes]) -> Self:
+        if args:
+            raise RuntimeError('MEMORY STATS command syntax: MEMORY STATS')
+        return cls()
+
+
+@dataclass(frozen=True)
+class MemoryUsageCommand(RedisCommand):
+    key: bytes
+    samples: Optional[int] = None
+
+    async def execute(self, conn: RedisConnection) -> RespValue:
+        usage = conn.database.memory_usage(self.key)
+        return RespNullBulkString if usage is None else resp_integer(usage)
+
+    def is_read_only(self) -> bool:
+        return True
+
     @classmethod
     def from_args(cls, args: List[bytes]) -> Self:
-        if len(args) != 1:
-            raise RuntimeError('INFO command syntax: INFO section')
-        return cls(section=args[0].decode())
+        if len(args) == 1:
+            return cls(key=args[0])
+        elif len(args) == 3 and args[1].upper() == b'SAMPLES':
+            return cls(key=args[0], samples=int(args[2]))
+        raise RuntimeError('MEMORY USAGE command syntax: MEMORY USAGE key [SAMPLES count]')
 
 
 @dataclass(frozen=True)
@@ -83,7 +219,7 @@ class ReplconfCommand(RedisCommand):
     async def execute(self, conn: RedisConnection) -> RespValue:
         if self.args[0] == 'GETACK':
             return ReplconfCommand(args=['ACK', str(conn.server.replication_offset)]).to_resp_array()
-        return RespSimpleString('OK')
+        return RespOk
 
     def to_resp_array(self) -> RespArray:
         return RespArray([RespBulkString('REPLCONF')] + [RespBulkString(arg) for arg in self.args])
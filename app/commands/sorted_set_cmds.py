@@ -1,23 +1,200 @@
 __all__ = (
+    'BzpopmaxCommand',
+    'BzpopminCommand',
     'ZaddCommand',
     'ZcardCommand',
+    'ZcountCommand',
+    'ZincrbyCommand',
+    'ZlexcountCommand',
+    'ZpopmaxCommand',
+    'ZpopminCommand',
     'ZrangeCommand',
+    'ZrangebylexCommand',
+    'ZrangebyscoreCommand',
     'ZrankCommand',
     'ZremCommand',
+    'ZremrangebyrankCommand',
+    'ZremrangebyscoreCommand',
+    'ZrevrangeCommand',
+    'ZrevrangebyscoreCommand',
     'ZscoreCommand',
 )
 
 
 from dataclasses import dataclass
-from typing import List, Self, Tuple
+from functools import partial
+from typing import ClassVar, Iterable, List, Optional, Self, Tuple
 
 from ..connection import RedisConnection
 from ..data_structs import RedisSortedSet
+from ..database import RedisDatabase
 from ..protocol import *
 
 from .base import RedisCommand
 
 
+def _entries_to_resp_array(entries: Iterable[Tuple[float, bytes]], with_scores: bool) -> RespArray:
+    if with_scores:
+        return RespArray([v for score, member in entries for v in (RespBulkString(member), RespBulkString(str(score)))])
+    return RespArray([RespBulkString(member) for _, member in entries])
+
+
+def _get_sorted_set(conn: RedisConnection, key: bytes) -> Optional[RedisSortedSet]:
+    zset = conn.database.get(key)
+    if zset is not None and not isinstance(zset, RedisSortedSet):
+        raise RuntimeError('WRONGTYPE')
+    return zset
+
+
+def _parse_limit(args: List[bytes]) -> Optional[Tuple[int, int]]:
+    if not args:
+        return None
+    if len(args) != 3 or args[0].upper() != b'LIMIT':
+        raise ValueError
+    return int(args[1]), int(args[2])
+
+
+def _parse_range_options(args: List[bytes]) -> Tuple[bool, Optional[Tuple[int, int]]]:
+    with_scores, limit = False, None
+    i = 0
+    while i < len(args):
+        option = args[i].upper()
+        if option == b'WITHSCORES':
+            with_scores = True
+            i += 1
+        elif option == b'LIMIT':
+            limit = _parse_limit(args[i:i + 3])
+            i += 3
+        else:
+            raise ValueError
+    return with_scores, limit
+
+
+def _limit_slice(start: int, stop: int, limit: Optional[Tuple[int, int]], reverse: bool = False) -> Tuple[int, int]:
+    if limit is None:
+        return start, stop
+
+    offset, count = limit
+    if offset < 0:
+        return 0, 0
+    if reverse:
+        stop = max(stop - offset, start)
+        return (start if count < 0 else max(stop - count, start)), stop
+    start = min(start + offset, stop)
+    return start, (stop if count < 0 else min(start + count, stop))
+
+
+def _pop(database: RedisDatabase, key: bytes, zset: RedisSortedSet, reverse: bool, count: int = 1) -> List[Tuple[float, bytes]]:
+    popped = zset.pop(count, reverse=reverse)
+    if not zset:
+        database.delete(key)
+    elif popped:
+        database.signal_modified(key)
+    return popped
+
+
+def _remove_slice(conn: RedisConnection, key: bytes, zset: RedisSortedSet, start: int, stop: int) -> RespValue:
+    removed = zset.remove_slice(start, stop)
+    if not zset:
+        conn.database.delete(key)
+    elif removed:
+        conn.database.signal_modified(key)
+    return resp_integer(removed)
+
+
+@dataclass(frozen=True)
+class _ScoreBound:
+    score: float
+    exclusive: bool = False
+
+    def lower_rank(self, zset: RedisSortedSet) -> int:
+        return zset.score_rank(self.score, after=self.exclusive)
+
+    def upper_rank(self, zset: RedisSortedSet) -> int:
+        return zset.score_rank(self.score, after=not self.exclusive)
+
+    @classmethod
+    def parse(cls, arg: bytes) -> Self:
+        if arg.startswith(b'('):
+            return cls(score=float(arg[1:]), exclusive=True)
+        return cls(score=float(arg))
+
+
+@dataclass(frozen=True)
+class _LexBound:
+    member: Optional[bytes]
+    exclusive: bool = False
+    positive: bool = False
+
+    def lower_rank(self, zset: RedisSortedSet) -> int:
+        if self.member is None:
+            return len(zset) if self.positive else 0
+        return zset.lex_rank(self.member, after=self.exclusive)
+
+    def upper_rank(self, zset: RedisSortedSet) -> int:
+        if self.member is None:
+            return len(zset) if self.positive else 0
+        return zset.lex_rank(self.member, after=not self.exclusive)
+
+    @classmethod
+    def parse(cls, arg: bytes) -> Self:
+        if arg in (b'-', b'+'):
+            return cls(member=None, positive=arg == b'+')
+        if arg[:1] not in (b'[', b'('):
+            raise ValueError
+        return cls(member=arg[1:], exclusive=arg.startswith(b'('))
+
+
+@dataclass(frozen=True)
+class _BlockingZpopCommandBase(RedisCommand):
+    NAME: ClassVar[str]
+    REVERSE: ClassVar[bool]
+
+    keys: List[bytes]
+    timeout: float
+
+    async def execute(self, conn: RedisConnection) -> RespValue:
+        database = conn.database
+        for key in self.keys:
+            if _get_sorted_set(conn, key) is not None:
+                return self._pop(database, key)
+
+        if conn.transaction.executing:
+            return RespNullArray
+
+        response = await database.wait_for(self.keys, partial(self._pop, database), timeout=self.timeout)
+        return RespNullArray if response is None else response
+
+    def _pop(self, database: RedisDatabase, key: bytes) -> Optional[RespValue]:
+        zset = database.get(key)
+        if not isinstance(zset, RedisSortedSet) or not zset:
+            return None
+
+        (score, member), = _pop(database, key, zset, self.REVERSE)
+        return RespArray([RespBulkString(key), RespBulkString(member), RespBulkString(str(score))])
+
+    def is_blocking(self) -> bool:
+        return True
+
+    @classmethod
+    def from_args(cls, args: List[bytes]) -> Self:
+        if len(args) < 2:
+            raise RuntimeError(f'{cls.NAME} command syntax: {cls.NAME} key [key ...] timeout')
+        return cls(keys=args[:-1], timeout=float(args[-1]))
+
+
+@dataclass(frozen=True)
+class BzpopmaxCommand(_BlockingZpopCommandBase):
+    NAME = 'BZPOPMAX'
+    REVERSE = True
+
+
+@dataclass(frozen=True)
+class BzpopminCommand(_BlockingZpopCommandBase):
+    NAME = 'BZPOPMIN'
+    REVERSE = False
+
+
 @dataclass(frozen=True)
 class ZaddCommand(RedisCommand):
     key: bytes
@@ -25,12 +202,17 @@ class ZaddCommand(RedisCommand):
 
     async def execute(self, conn: RedisConnection) -> RespValue:
         database = conn.database
-        async with database.lock:
-            zset = database.setdefault(self.key, RedisSortedSet())
-            if not isinstance(zset, RedisSortedSet):
-                raise RuntimeError('WRONGTYPE')
+        zset = database.setdefault(self.key, RedisSortedSet())
+        if not isinstance(zset, RedisSortedSet):
+            raise RuntimeError('WRONGTYPE')
+
+        added = zset.add(self.score_member_pairs)
+        database.signal_modified(self.key)
+        database.notify(self.key)
+        return resp_integer(added)
 
-            return RespInteger(zset.add(self.score_member_pairs))
+    def is_denyoom(self) -> bool:
+        return True
 
     @classmethod
     def from_args(cls, args: List[bytes]) -> Self:
@@ -48,15 +230,17 @@ class ZcardCommand(RedisCommand):
 
     async def execute(self, conn: RedisConnection) -> RespValue:
         database = conn.database
-        async with database.lock:
-            zset = database.get(self.key)
-            if zset is None:
-                return RespInteger(0)
+        zset = database.get(self.key)
+        if zset is None:
+            return resp_integer(0)
 
-            if not isinstance(zset, RedisSortedSet):
-                raise RuntimeError('WRONGTYPE')
+        if not isinstance(zset, RedisSortedSet):
+            raise RuntimeError('WRONGTYPE')
 
-            return RespInteger(len(zset))
+        return resp_integer(len(zset))
+
+    def is_read_only(self) -> bool:
+        return True
 
     @classmethod
     def from_args(cls, args: List[bytes]) -> Self:
@@ -65,30 +249,219 @@ class ZcardCommand(RedisCommand):
         return cls(key=args[0])
 
 
+@dataclass(frozen=True)
+class ZcountCommand(RedisCommand):
+    key: bytes
+    min: _ScoreBound
+    max: _ScoreBound
+
+    async def execute(self, conn: RedisConnection) -> RespValue:
+        zset = _get_sorted_set(conn, self.key)
+        if zset is None:
+            return resp_integer(0)
+        return resp_integer(max(self.max.upper_rank(zset) - self.min.lower_rank(zset), 0))
+
+    def is_read_only(self) -> bool:
+        return True
+
+    @classmethod
+    def from_args(cls, args: List[bytes]) -> Self:
+        if len(args) != 3:
+            raise RuntimeError('ZCOUNT command syntax: ZCOUNT key min max')
+        return cls(key=args[0], min=_ScoreBound.parse(args[1]), max=_ScoreBound.parse(args[2]))
+
+
+@dataclass(frozen=True)
+class ZincrbyCommand(RedisCommand):
+    key: bytes
+    increment: float
+    member: bytes
+
+    async def execute(self, conn: RedisConnection) -> RespValue:
+        database = conn.database
+        zset = database.get(self.key)
+        if zset is not None and not isinstance(zset, RedisSortedSet):
+            raise RuntimeError('WRONGTYPE')
+
+        created = zset is None
+        if created:
+            zset = RedisSortedSet()
+        try:
+            score = zset.incr(self.member, self.increment)
+        except ValueError:
+            return RespSimpleError('ERR resulting score is not a number (NaN)')
+
+        if created:
+            database.set(self.key, zset)
+        else:
+            database.signal_modified(self.key)
+        database.notify(self.key)
+        return RespBulkString(str(score))
+
+    def is_denyoom(self) -> bool:
+        return True
+
+    @classmethod
+    def from_args(cls, args: List[bytes]) -> Self:
+        if len(args) != 3:
+            raise RuntimeError('ZINCRBY command syntax: ZINCRBY key increment member')
+        return cls(key=args[0], increment=float(args[1]), member=args[2])
+
+
+@dataclass(frozen=True)
+class ZlexcountCommand(RedisCommand):
+    key: bytes
+    min: _LexBound
+    max: _LexBound
+
+    async def execute(self, conn: RedisConnection) -> RespValue:
+        zset = _get_sorted_set(conn, self.key)
+        if zset is None:
+            return resp_integer(0)
+        return resp_integer(max(self.max.upper_rank(zset) - self.min.lower_rank(zset), 0))
+
+    def is_read_only(self) -> bool:
+        return True
+
+    @classmethod
+    def from_args(cls, args: List[bytes]) -> Self:
+        if len(args) != 3:
+            raise RuntimeError('ZLEXCOUNT command syntax: ZLEXCOUNT key min max')
+        return cls(key=args[0], min=_LexBound.parse(args[1]), max=_LexBound.parse(args[2]))
+
+
+@dataclass(frozen=True)
+class _ZpopCommandBase(RedisCommand):
+    NAME: ClassVar[str]
+    REVERSE: ClassVar[bool]
+
+    key: bytes
+    count: int = 1
+
+    async def execute(self, conn: RedisConnection) -> RespValue:
+        zset = _get_sorted_set(conn, self.key)
+        if zset is None:
+            return RespEmptyArray
+
+        popped = _pop(conn.database, self.key, zset, self.REVERSE, self.count)
+        return _entries_to_resp_array(popped, with_scores=True)
+
+    @classmethod
+    def from_args(cls, args: List[bytes]) -> Self:
+        if len(args) == 1:
+            return cls(key=args[0])
+        elif len(args) == 2:
+            return cls(key=args[0], count=int(args[1]))
+        raise RuntimeError(f'{cls.NAME} command syntax: {cls.NAME} key [count]')
+
+
+@dataclass(frozen=True)
+class ZpopmaxCommand(_ZpopCommandBase):
+    NAME = 'ZPOPMAX'
+    REVERSE = True
+
+
+@dataclass(frozen=True)
+class ZpopminCommand(_ZpopCommandBase):
+    NAME = 'ZPOPMIN'
+    REVERSE = False
+
+
 @dataclass(frozen=True)
 class ZrangeCommand(RedisCommand):
     key: bytes
     start: int
     stop: int
+    reverse: bool = False
+    with_scores: bool = False
 
     async def execute(self, conn: RedisConnection) -> RespValue:
         database = conn.database
-        async with database.lock:
-            zset = database.get(self.key)
-            if zset is None:
-                return RespArray([])
+        zset = database.get(self.key)
+        if zset is None:
+            return RespEmptyArray
+
+        if not isinstance(zset, RedisSortedSet):
+            raise RuntimeError('WRONGTYPE')
 
-            if not isinstance(zset, RedisSortedSet):
-                raise RuntimeError('WRONGTYPE')
+        entries = zset.get_range(self.start, self.stop, reverse=self.reverse)
+        return _entries_to_resp_array(entries, self.with_scores)
 
-            elements = zset.get_range(self.start, self.stop)
-            return RespArray([RespBulkString(e) for e in elements])
+    def is_read_only(self) -> bool:
+        return True
 
     @classmethod
     def from_args(cls, args: List[bytes]) -> Self:
-        if len(args) != 3:
-            raise RuntimeError('ZRANGE command syntax: ZRANGE key start stop')
-        return cls(key=args[0], start=int(args[1]), stop=int(args[2]))
+        options = {arg.upper() for arg in args[3:]}
+        if len(args) < 3 or not options <= {b'REV', b'WITHSCORES'} or len(options) != len(args) - 3:
+            raise RuntimeError('ZRANGE command syntax: ZRANGE key start stop [REV] [WITHSCORES]')
+        return cls(
+            key=args[0],
+            start=int(args[1]),
+            stop=int(args[2]),
+            reverse=b'REV' in options,
+            with_scores=b'WITHSCORES' in options,
+        )
+
+
+@dataclass(frozen=True)
+class ZrangebylexCommand(RedisCommand):
+    key: bytes
+    min: _LexBound
+    max: _LexBound
+    limit: Optional[Tuple[int, int]] = None
+
+    async def execute(self, conn: RedisConnection) -> RespValue:
+        zset = _get_sorted_set(conn, self.key)
+        if zset is None:
+            return RespEmptyArray
+
+        start, stop = _limit_slice(self.min.lower_rank(zset), self.max.upper_rank(zset), self.limit)
+        return _entries_to_resp_array(zset.get_slice(start, stop), with_scores=False)
+
+    def is_read_only(self) -> bool:
+        return True
+
+    @classmethod
+    def from_args(cls, args: List[bytes]) -> Self:
+        try:
+            return cls(key=args[0], min=_LexBound.parse(args[1]), max=_LexBound.parse(args[2]), limit=_parse_limit(args[3:]))
+        except (IndexError, ValueError):
+            raise RuntimeError('ZRANGEBYLEX command syntax: ZRANGEBYLEX key min max [LIMIT offset count]')
+
+
+@dataclass(frozen=True)
+class ZrangebyscoreCommand(RedisCommand):
+    key: bytes
+    min: _ScoreBound
+    max: _ScoreBound
+    with_scores: bool = False
+    limit: Optional[Tuple[int, int]] = None
+
+    async def execute(self, conn: RedisConnection) -> RespValue:
+        zset = _get_sorted_set(conn, self.key)
+        if zset is None:
+            return RespEmptyArray
+
+        start, stop = _limit_slice(self.min.lower_rank(zset), self.max.upper_rank(zset), self.limit)
+        return _entries_to_resp_array(zset.get_slice(start, stop), self.with_scores)
+
+    def is_read_only(self) -> bool:
+        return True
+
+    @classmethod
+    def from_args(cls, args: List[bytes]) -> Self:
+        try:
+            with_scores, limit = _parse_range_options(args[3:])
+            return cls(
+                key=args[0],
+                min=_ScoreBound.parse(args[1]),
+                max=_ScoreBound.parse(args[2]),
+                with_scores=with_scores,
+                limit=limit,
+            )
+        except (IndexError, ValueError):
+            raise RuntimeError('ZRANGEBYSCORE command syntax: ZRANGEBYSCORE key min max [WITHSCORES] [LIMIT offset count]')
 
 
 @dataclass(frozen=True)
@@ -98,18 +471,20 @@ class ZrankCommand(RedisCommand):
 
     async def execute(self, conn: RedisConnection) -> RespValue:
         database = conn.database
-        async with database.lock:
-            zset = database.get(self.key)
-            if zset is None:
-                return RespNullBulkString
+        zset = database.get(self.key)
+        if zset is None:
+            return RespNullBulkString
+
+        if not isinstance(zset, RedisSortedSet):
+            raise RuntimeError('WRONGTYPE')
 
-            if not isinstance(zset, RedisSortedSet):
-                raise RuntimeError('WRONGTYPE')
+        try:
+            return resp_integer(zset.get_rank(self.member))
+        except ValueError:
+            return RespNullBulkString
 
-            try:
-                return RespInteger(zset.get_rank(self.member))
-            except ValueError:
-                return RespNullBulkString
+    def is_read_only(self) -> bool:
+        return True
 
     @classmethod
     def from_args(cls, args: List[bytes]) -> Self:
@@ -125,15 +500,19 @@ class ZremCommand(RedisCommand):
 
     async def execute(self, conn: RedisConnection) -> RespValue:
         database = conn.database
-        async with database.lock:
-            zset = database.get(self.key)
-            if zset is None:
-                return RespInteger(0)
+        zset = database.get(self.key)
+        if zset is None:
+            return resp_integer(0)
 
-            if not isinstance(zset, RedisSortedSet):
-                raise RuntimeError('WRONGTYPE')
+        if not isinstance(zset, RedisSortedSet):
+            raise RuntimeError('WRONGTYPE')
 
-            return RespInteger(zset.remove(self.members))
+        removed = zset.remove(self.members)
+        if not zset:
+            database.delete(self.key)
+        else:
+            database.signal_modified(self.key)
+        return resp_integer(removed)
 
     @classmethod
     def from_args(cls, args: List[bytes]) -> Self:
@@ -142,6 +521,104 @@ class ZremCommand(RedisCommand):
         return cls(key=args[0], members=args[1:])
 
 
+@dataclass(frozen=True)
+class ZremrangebyrankCommand(RedisCommand):
+    key: bytes
+    start: int
+    stop: int
+
+    async def execute(self, conn: RedisConnection) -> RespValue:
+        zset = _get_sorted_set(conn, self.key)
+        if zset is None:
+            return resp_integer(0)
+
+        start, stop = zset.normalize_range(self.start, self.stop)
+        return _remove_slice(conn, self.key, zset, start, stop)
+
+    @classmethod
+    def from_args(cls, args: List[bytes]) -> Self:
+        if len(args) != 3:
+            raise RuntimeError('ZREMRANGEBYRANK command syntax: ZREMRANGEBYRANK key start stop')
+        return cls(key=args[0], start=int(args[1]), stop=int(args[2]))
+
+
+@dataclass(frozen=True)
+class ZremrangebyscoreCommand(RedisCommand):
+    key: bytes
+    min: _ScoreBound
+    max: _ScoreBound
+
+    async def execute(self, conn: RedisConnection) -> RespValue:
+        zset = _get_sorted_set(conn, self.key)
+        if zset is None:
+            return resp_integer(0)
+
+        return _remove_slice(conn, self.key, zset, self.min.lower_rank(zset), self.max.upper_rank(zset))
+
+    @classmethod
+    def from_args(cls, args: List[bytes]) -> Self:
+        if len(args) != 3:
+            raise RuntimeError('ZREMRANGEBYSCORE command syntax: ZREMRANGEBYSCORE key min max')
+        return cls(key=args[0], min=_ScoreBound.parse(args[1]), max=_ScoreBound.parse(args[2]))
+
+
+@dataclass(frozen=True)
+class ZrevrangeCommand(RedisCommand):
+    key: bytes
+    start: int
+    stop: int
+    with_scores: bool = False
+
+    async def execute(self, conn: RedisConnection) -> RespValue:
+        zset = _get_sorted_set(conn, self.key)
+        if zset is None:
+            return RespEmptyArray
+        return _entries_to_resp_array(zset.get_range(self.start, self.stop, reverse=True), self.with_scores)
+
+    def is_read_only(self) -> bool:
+        return True
+
+    @classmethod
+    def from_args(cls, args: List[bytes]) -> Self:
+        if len(args) not in (3, 4) or (len(args) == 4 and args[3].upper() != b'WITHSCORES'):
+            raise RuntimeError('ZREVRANGE command syntax: ZREVRANGE key start stop [WITHSCORES]')
+        return cls(key=args[0], start=int(args[1]), stop=int(args[2]), with_scores=len(args) == 4)
+
+
+@dataclass(frozen=True)
+class ZrevrangebyscoreCommand(RedisCommand):
+    key: bytes
+    max: _ScoreBound
+    min: _ScoreBound
+    with_scores: bool = False
+    limit: Optional[Tuple[int, int]] = None
+
+    async def execute(self, conn: RedisConnection) -> RespValue:
+        zset = _get_sorted_set(conn, self.key)
+        if zset is None:
+            return RespEmptyArray
+
+        start, stop = _limit_slice(self.min.lower_rank(zset), self.max.upper_rank(zset), self.limit, reverse=True)
+        return _entries_to_resp_array(zset.get_slice(start, stop, reverse=True), self.with_scores)
+
+    def is_read_only(self) -> bool:
+        return True
+
+    @classmethod
+    def from_args(cls, args: List[bytes]) -> Self:
+        try:
+            with_scores, limit = _parse_range_options(args[3:])
+            return cls(
+                key=args[0],
+                max=_ScoreBound.parse(args[1]),
+                min=_ScoreBound.parse(args[2]),
+                with_scores=with_scores,
+                limit=limit,
+            )
+        except (IndexError, ValueError):
+            raise RuntimeError('ZREVRANGEBYSCORE command syntax: ZREVRANGEBYSCORE key max min [WITHSCORES] [LIMIT offset count]')
+
+
 @dataclass(frozen=True)
 class ZscoreCommand(RedisCommand):
     key: bytes
@@ -149,19 +626,21 @@ class ZscoreCommand(RedisCommand):
 
     async def execute(self, conn: RedisConnection) -> RespValue:
         database = conn.database
-        async with database.lock:
-            zset = database.get(self.key)
-            if zset is None:
-                return RespNullBulkString
-
-            if not isinstance(zset, RedisSortedSet):
-                raise RuntimeError('WRONGTYPE')
-
-            try:
-                score = zset.get_score(self.member)
-                return RespBulkString(str(score))
-            except ValueError:
-                return RespNullBulkString
+        zset = database.get(self.key)
+        if zset is None:
+            return RespNullBulkString
+
+        if not isinstance(zset, RedisSortedSet):
+            raise RuntimeError('WRONGTYPE')
+
+        try:
+            score = zset.get_score(self.member)
+            return RespBulkString(str(score))
+        except ValueError:
+            return RespNullBulkString
+
+    def is_read_only(self) -> bool:
+        return True
 
     @classmethod
     def from_args(cls, args: List[bytes]) -> Self:
@@ -1,12 +1,12 @@
-__all__ = ('XaddCommand', 'XrangeCommand', 'XreadCommand')
+__all__ = ('XaddCommand', 'XlenCommand', 'XrangeCommand', 'XreadCommand')
 
 
 import time
 from dataclasses import dataclass
-from typing import List, Optional, Self, Tuple
+from typing import Dict, List, Optional, Self, Tuple
 
 from ..connection import RedisConnection
-from ..data_structs import EntryId, RedisDataStruct, RedisStream, StreamEntry
+from ..data_structs import EntryId, RedisStream, StreamEntry
 from ..database import RedisDatabase
 from ..protocol import *
 
@@ -39,23 +39,26 @@ class XaddCommand(RedisCommand):
 
     async def execute(self, conn: RedisConnection) -> RespValue:
         database = conn.database
-        async with database.lock:
-            stream = database.setdefault(self.key, RedisStream())
-            if not isinstance(stream, RedisStream):
-                raise RuntimeError('WRONGTYPE')
+        stream = database.setdefault(self.key, RedisStream())
+        if not isinstance(stream, RedisStream):
+            raise RuntimeError('WRONGTYPE')
 
-            try:
-                entry_id = self._parse_id(stream)
-            except ValueError:
-                return RespSimpleError('ERR The ID specified in XADD must be greater than 0-0')
+        try:
+            entry_id = self._parse_id(stream)
+        except ValueError:
+            return RespSimpleError('ERR The ID specified in XADD must be greater than 0-0')
 
-            try:
-                stream.add(entry_id, self.fvpairs)
-            except ValueError:
-                return RespSimpleError('ERR The ID specified in XADD is equal or smaller than the target stream top item')
+        try:
+            stream.add(entry_id, self.fvpairs)
+        except ValueError:
+            return RespSimpleError('ERR The ID specified in XADD is equal or smaller than the target stream top item')
 
-            database.notify(self.key)
-            return RespBulkString(str(entry_id))
+        database.signal_modified(self.key)
+        database.notify(self.key)
+        return RespBulkString(str(entry_id))
+
+    def is_denyoom(self) -> bool:
+        return True
 
     def _parse_id(self, stream: RedisStream) -> EntryId:
         if self.id_str == '*':
@@ -83,6 +86,31 @@ class XaddCommand(RedisCommand):
         )
 
 
+@dataclass(frozen=True)
+class XlenCommand(RedisCommand):
+    key: bytes
+
+    async def execute(self, conn: RedisConnection) -> RespValue:
+        database = conn.database
+        stream = database.get(self.key)
+        if stream is None:
+            return resp_integer(0)
+
+        if not isinstance(stream, RedisStream):
+            raise RuntimeError('WRONGTYPE')
+
+        return resp_integer(len(stream))
+
+    def is_read_only(self) -> bool:
+        return True
+
+    @classmethod
+    def from_args(cls, args: List[bytes]) -> Self:
+        if len(args) != 1:
+            raise RuntimeError('XLEN command syntax: XLEN key')
+        return cls(key=args[0])
+
+
 @dataclass(frozen=True)
 class XrangeCommand(RedisCommand):
     key: bytes
@@ -91,16 +119,18 @@ class XrangeCommand(RedisCommand):
 
     async def execute(self, conn: RedisConnection) -> RespValue:
         database = conn.database
-        async with database.lock:
-            stream = database.get(self.key)
-            if stream is None:
-                return RespArray([])
+        stream = database.get(self.key)
+        if stream is None:
+            return RespEmptyArray
 
-            if not isinstance(stream, RedisStream):
-                raise RuntimeError('WRONGTYPE')
+        if not isinstance(stream, RedisStream):
+            raise RuntimeError('WRONGTYPE')
+
+        entries = stream.get_range(self._parse_start_id(), self._parse_end_id(stream))
+        return RespArray([_entry_to_resp_array(e) for e in entries])
 
-            entries = stream.get_range(self._parse_start_id(), self._parse_end_id(stream))
-            return RespArray([_entry_to_resp_array(e) for e in entries])
+    def is_read_only(self) -> bool:
+        return True
 
     def _parse_start_id(self) -> EntryId:
         if self.start_id_str == '-':
@@ -144,30 +174,50 @@ class XreadCommand(RedisCommand):
 
     async def execute(self, conn: RedisConnection) -> RespValue:
         database = conn.database
-        async with database.lock:
-            if self.block_ms is not None:
-                return await self._block(database)
+        if self.block_ms is not None:
+            return await self._block(conn)
+        else:
+            return self._no_block(database)
+
+    def is_read_only(self) -> bool:
+        return True
+
+    def is_blocking(self) -> bool:
+        return self.block_ms is not None
+
+    async def _block(self, conn: RedisConnection) -> RespValue:
+        database = conn.database
+        start_ids: Dict[bytes, EntryId] = {}
+        for key, id_str in zip(self.keys, self.id_strs):
+            stream = database.get(key)
+            if stream is None:
+                start_ids[key] = EntryId(0, 1)
+            elif not isinstance(stream, RedisStream):
+                raise RuntimeError('WRONGTYPE')
             else:
-                return self._no_block(database)
+                start_ids[key] = stream.auto_gen_next_id() if id_str == '$' else self._parse_id(id_str)
 
-    async def _block(self, database: RedisDatabase) -> RespValue:
-        key = self.keys[0]
-        stream = database.get(key)
-        if stream is None:
-            start_id = EntryId(0, 1)
-        elif not isinstance(stream, RedisStream):
-            raise RuntimeError('WRONGTYPE')
-        else:
-            id_str = self.id_strs[0]
-            start_id = stream.auto_gen_next_id() if id_str == '$' else self._parse_id(id_str)
+        def read(key: bytes) -> Optional[RespArray]:
+            stream = database.get(key)
+            if not isinstance(stream, RedisStream):
+                return None
 
-        def predicate(v: RedisDataStruct) -> bool:
-            return isinstance(v, RedisStream) and bool(v.read(start_id))
+            entries = stream.read(start_ids[key])
+            return _key_and_entries_to_resp_array(key, entries) if entries else None
 
-        stream = await database.wait_for(key, predicate, timeout=self.block_ms / 1000)
-        if stream is None:
+        values = [value for key in self.keys if (value := read(key)) is not None]
+        if values:
+            return RespArray(values)
+
+        if conn.transaction.executing:
             return RespNullArray
-        return RespArray([_key_and_entries_to_resp_array(key, stream.read(start_id))])
+
+        def serve(key: bytes) -> Optional[RespArray]:
+            value = read(key)
+            return None if value is None else RespArray([value])
+
+        response = await database.wait_for(self.keys, serve, timeout=self.block_ms / 1000)
+        return RespNullArray if response is None else response
 
     def _no_block(self, database: RedisDatabase) -> RespValue:
         values = []
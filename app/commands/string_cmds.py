@@ -1,32 +1,132 @@
-__all__ = 'GetCommand', 'IncrCommand', 'SetCommand'
+__all__ = ('AppendCommand', 'DecrCommand', 'DecrbyCommand', 'GetCommand', 'GetrangeCommand', 'IncrCommand', 'IncrbyCommand',
+           'IncrbyfloatCommand', 'MgetCommand', 'MsetCommand', 'MsetnxCommand', 'SetCommand', 'SetrangeCommand',
+           'StrlenCommand')
 
 
 from dataclasses import dataclass
-from typing import List, Optional, Self
+from typing import ClassVar, List, Optional, Self, Tuple
 
 from ..connection import RedisConnection
 from ..data_structs import RedisString
-from ..database import Expiry
+from ..database import expiry_from_kwargs
 from ..protocol import *
 
 from .base import RedisCommand
 
 
+_PROTO_MAX_BULK_LEN = 512 * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class AppendCommand(RedisCommand):
+    key: bytes
+    value: bytes
+
+    async def execute(self, conn: RedisConnection) -> RespValue:
+        database = conn.database
+        string = database.get(self.key)
+        if string is None:
+            database.set(self.key, RedisString(self.value))
+            return resp_integer(len(self.value))
+
+        if not isinstance(string, RedisString):
+            raise RuntimeError('WRONGTYPE')
+
+        if len(string) + len(self.value) > _PROTO_MAX_BULK_LEN:
+            return RespSimpleError('ERR string exceeds maximum allowed size (proto-max-bulk-len)')
+
+        length = string.append(self.value)
+        database.signal_modified(self.key)
+        return resp_integer(length)
+
+    def is_denyoom(self) -> bool:
+        return True
+
+    def is_write_command(self) -> bool:
+        return True
+
+    def to_resp_array(self) -> RespArray:
+        return RespArray([RespBulkString('APPEND'), RespBulkString(self.key), RespBulkString(self.value)])
+
+    @classmethod
+    def from_args(cls, args: List[bytes]) -> Self:
+        if len(args) != 2:
+            raise RuntimeError('APPEND command syntax: APPEND key value')
+        return cls(key=args[0], value=args[1])
+
+
+@dataclass(frozen=True)
+class _IncrCommandBase(RedisCommand):
+    key: bytes
+    increment: int = 1
+
+    async def execute(self, conn: RedisConnection) -> RespValue:
+        database = conn.database
+        value = database.get(self.key)
+        if value is not None and not isinstance(value, RedisString):
+            raise RuntimeError('WRONGTYPE')
+
+        created = value is None
+        if created:
+            value = RedisString(0)
+        try:
+            result = value.incr(self.increment)
+        except ValueError:
+            return RespSimpleError('ERR value is not an integer or out of range')
+        except OverflowError:
+            return RespSimpleError('ERR increment or decrement would overflow')
+
+        if created:
+            database.set(self.key, value)
+        else:
+            database.signal_modified(self.key)
+        return resp_integer(result)
+
+    def is_denyoom(self) -> bool:
+        return True
+
+    def is_write_command(self) -> bool:
+        return True
+
+    def to_resp_array(self) -> RespArray:
+        return RespArray([RespBulkString('INCRBY'), RespBulkString(self.key), RespBulkString(str(self.increment))])
+
+
+@dataclass(frozen=True)
+class DecrCommand(_IncrCommandBase):
+    @classmethod
+    def from_args(cls, args: List[bytes]) -> Self:
+        if len(args) != 1:
+            raise RuntimeError('DECR command syntax: DECR key')
+        return cls(key=args[0], increment=-1)
+
+
+@dataclass(frozen=True)
+class DecrbyCommand(_IncrCommandBase):
+    @classmethod
+    def from_args(cls, args: List[bytes]) -> Self:
+        if len(args) != 2:
+            raise RuntimeError('DECRBY command syntax: DECRBY key decrement')
+        return cls(key=args[0], increment=-int(args[1]))
+
+
 @dataclass(frozen=True)
 class GetCommand(RedisCommand):
     key: bytes
 
     async def execute(self, conn: RedisConnection) -> RespValue:
         database = conn.database
-        async with database.lock:
-            value = database.get(self.key)
-            if value is None:
-                return RespNullBulkString
+        value = database.get(self.key)
+        if value is None:
+            return RespNullBulkString
+
+        if not isinstance(value, RedisString):
+            raise RuntimeError('WRONGTYPE')
 
-            if not isinstance(value, RedisString):
-                raise RuntimeError('WRONGTYPE')
+        return RespBulkString(value.to_bytes())
 
-            return RespBulkString(value.to_bytes())
+    def is_read_only(self) -> bool:
+        return True
 
     @classmethod
     def from_args(cls, args: List[bytes]) -> Self:
@@ -36,21 +136,34 @@ class GetCommand(RedisCommand):
 
 
 @dataclass(frozen=True)
-class IncrCommand(RedisCommand):
+class GetrangeCommand(RedisCommand):
     key: bytes
+    start: int
+    end: int
 
     async def execute(self, conn: RedisConnection) -> RespValue:
         database = conn.database
-        async with database.lock:
-            value = database.setdefault(self.key, RedisString(b'0'))
-            if not isinstance(value, RedisString):
-                raise RuntimeError('WRONGTYPE')
+        value = database.get(self.key)
+        if value is None:
+            return RespBulkString(b'')
+
+        if not isinstance(value, RedisString):
+            raise RuntimeError('WRONGTYPE')
+
+        return RespBulkString(value.get_range(self.start, self.end))
+
+    def is_read_only(self) -> bool:
+        return True
+
+    @classmethod
+    def from_args(cls, args: List[bytes]) -> Self:
+        if len(args) != 3:
+            raise RuntimeError('GETRANGE command syntax: GETRANGE key start end')
+        return cls(key=args[0], start=int(args[1]), end=int(args[2]))
 
-            try:
-                return RespInteger(value.incr())
-            except ValueError:
-                return RespSimpleError('ERR value is not an integer or out of range')
 
+@dataclass(frozen=True)
+class IncrCommand(_IncrCommandBase):
     @classmethod
     def from_args(cls, args: List[bytes]) -> Self:
         if len(args) != 1:
@@ -58,18 +171,147 @@ class IncrCommand(RedisCommand):
         return cls(key=args[0])
 
 
+@dataclass(frozen=True)
+class IncrbyCommand(_IncrCommandBase):
+    @classmethod
+    def from_args(cls, args: List[bytes]) -> Self:
+        if len(args) != 2:
+            raise RuntimeError('INCRBY command syntax: INCRBY key increment')
+        return cls(key=args[0], increment=int(args[1]))
+
+
+@dataclass(frozen=True)
+class IncrbyfloatCommand(RedisCommand):
+    key: bytes
+    increment: float
+
+    async def execute(self, conn: RedisConnection) -> RespValue:
+        database = conn.database
+        value = database.get(self.key)
+        if value is not None and not isinstance(value, RedisString):
+            raise RuntimeError('WRONGTYPE')
+
+        created = value is None
+        if created:
+            value = RedisString(0)
+        try:
+            result = value.incr_float(self.increment)
+        except ValueError:
+            return RespSimpleError('ERR value is not a valid float')
+        except OverflowError:
+            return RespSimpleError('ERR increment would produce NaN or Infinity')
+
+        if created:
+            database.set(self.key, value)
+        else:
+            database.signal_modified(self.key)
+        return RespBulkString(result)
+
+    def is_denyoom(self) -> bool:
+        return True
+
+    def is_write_command(self) -> bool:
+        return True
+
+    def to_resp_array(self) -> RespArray:
+        return RespArray([RespBulkString('INCRBYFLOAT'), RespBulkString(self.key), RespBulkString(repr(self.increment))])
+
+    @classmethod
+    def from_args(cls, args: List[bytes]) -> Self:
+        if len(args) != 2:
+            raise RuntimeError('INCRBYFLOAT command syntax: INCRBYFLOAT key increment')
+        return cls(key=args[0], increment=float(args[1]))
+
+
+@dataclass(frozen=True)
+class MgetCommand(RedisCommand):
+    keys: List[bytes]
+
+    async def execute(self, conn: RedisConnection) -> RespValue:
+        get = conn.database.get
+        values = []
+        for key in self.keys:
+            value = get(key)
+            values.append(RespBulkString(value.to_bytes()) if isinstance(value, RedisString) else RespNullBulkString)
+        return RespArray(values)
+
+    def is_read_only(self) -> bool:
+        return True
+
+    @classmethod
+    def from_args(cls, args: List[bytes]) -> Self:
+        if not args:
+            raise RuntimeError('MGET command syntax: MGET key [key ...]')
+        return cls(keys=args)
+
+
+@dataclass(frozen=True)
+class _MsetCommandBase(RedisCommand):
+    NAME: ClassVar[str]
+
+    pairs: List[Tuple[bytes, bytes]]
+
+    def is_denyoom(self) -> bool:
+        return True
+
+    def is_write_command(self) -> bool:
+        return True
+
+    def to_resp_array(self) -> RespArray:
+        return RespArray([RespBulkString(self.NAME), *(RespBulkString(arg) for pair in self.pairs for arg in pair)])
+
+    def _set_all(self, conn: RedisConnection) -> None:
+        database = conn.database
+        for key, value in self.pairs:
+            database.set(key, RedisString(value))
+
+    @classmethod
+    def from_args(cls, args: List[bytes]) -> Self:
+        if not args or len(args) % 2:
+            raise RuntimeError(f'{cls.NAME} command syntax: {cls.NAME} key value [key value ...]')
+        return cls(pairs=list(zip(args[::2], args[1::2])))
+
+
+@dataclass(frozen=True)
+class MsetCommand(_MsetCommandBase):
+    NAME = 'MSET'
+
+    async def execute(self, conn: RedisConnection) -> RespValue:
+        self._set_all(conn)
+        return RespOk
+
+
+@dataclass(frozen=True)
+class MsetnxCommand(_MsetCommandBase):
+    NAME = 'MSETNX'
+
+    async def execute(self, conn: RedisConnection) -> RespValue:
+        database = conn.database
+        if any(database.exists(key) for key, _ in self.pairs):
+            return resp_integer(0)
+
+        self._set_all(conn)
+        return resp_integer(1)
+
+
 @dataclass(frozen=True)
 class SetCommand(RedisCommand):
     key: bytes
     value: bytes
     px: Optional[int] = None
+    keepttl: bool = False
 
     async def execute(self, conn: RedisConnection) -> RespValue:
         database = conn.database
-        async with database.lock:
-            expiry = Expiry.from_kwargs(px=self.px)
-            database.set(self.key, RedisString(self.value), expiry)
-            return RespSimpleString('OK')
+        if self.keepttl:
+            expiry = database.get_expiry(self.key) if database.exists(self.key) else None
+        else:
+            expiry = expiry_from_kwargs(px=self.px)
+        database.set(self.key, RedisString(self.value), expiry)
+        return RespOk
+
+    def is_denyoom(self) -> bool:
+        return True
 
     def is_write_command(self) -> bool:
         return True
@@ -78,12 +320,89 @@ class SetCommand(RedisCommand):
         bulk_strs = [RespBulkString('SET'), RespBulkString(self.key), RespBulkString(self.value)]
         if self.px is not None:
             bulk_strs += [RespBulkString('PX'), RespBulkString(str(self.px))]
+        elif self.keepttl:
+            bulk_strs.append(RespBulkString('KEEPTTL'))
         return RespArray(bulk_strs)
 
     @classmethod
     def from_args(cls, args: List[bytes]) -> Self:
         if len(args) == 2:
             return cls(key=args[0], value=args[1])
+        elif len(args) == 3 and args[2].upper() == b'KEEPTTL':
+            return cls(key=args[0], value=args[1], keepttl=True)
         elif len(args) == 4 and args[2].upper() == b'PX':
             return cls(key=args[0], value=args[1], px=int(args[3]))
-        raise RuntimeError('SET command syntax: SET key value [PX milliseconds]')
+        raise RuntimeError('SET command syntax: SET key value [PX milliseconds | KEEPTTL]')
+
+
+@dataclass(frozen=True)
+class SetrangeCommand(RedisCommand):
+    key: bytes
+    offset: int
+    value: bytes
+
+    async def execute(self, conn: RedisConnection) -> RespValue:
+        database = conn.database
+        string = database.get(self.key)
+        if string is not None and not isinstance(string, RedisString):
+            raise RuntimeError('WRONGTYPE')
+
+        if self.offset < 0:
+            return RespSimpleError('ERR offset is out of range')
+        if self.offset + len(self.value) > _PROTO_MAX_BULK_LEN:
+            return RespSimpleError('ERR string exceeds maximum allowed size (proto-max-bulk-len)')
+
+        if not self.value:
+            return resp_integer(0 if string is None else len(string))
+
+        if string is None:
+            string = RedisString(b'')
+            database.set(self.key, string)
+        length = string.set_range(self.offset, self.value)
+        database.signal_modified(self.key)
+        return resp_integer(length)
+
+    def is_denyoom(self) -> bool:
+        return True
+
+    def is_write_command(self) -> bool:
+        return True
+
+    def to_resp_array(self) -> RespArray:
+        return RespArray([
+            RespBulkString('SETRANGE'),
+            RespBulkString(self.key),
+            RespBulkString(str(self.offset)),
+            RespBulkString(self.value),
+        ])
+
+    @classmethod
+    def from_args(cls, args: List[bytes]) -> Self:
+        if len(args) != 3:
+            raise RuntimeError('SETRANGE command syntax: SETRANGE key offset value')
+        return cls(key=args[0], offset=int(args[1]), value=args[2])
+
+
+@dataclass(frozen=True)
+class StrlenCommand(RedisCommand):
+    key: bytes
+
+    async def execute(self, conn: RedisConnection) -> RespValue:
+        database = conn.database
+        value = database.get(self.key)
+        if value is None:
+            return resp_integer(0)
+
+        if not isinstance(value, RedisString):
+            raise RuntimeError('WRONGTYPE')
+
+        return resp_integer(len(value))
+
+    def is_read_only(self) -> bool:
+        return True
+
+    @classmethod
+    def from_args(cls, args: List[bytes]) -> Self:
+        if len(args) != 1:
+            raise RuntimeError('STRLEN command syntax: STRLEN key')
+        return cls(key=args[0])
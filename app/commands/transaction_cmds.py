@@ -15,7 +15,7 @@ class DiscardCommand(RedisCommand):
     async def execute(self, conn: RedisConnection) -> RespValue:
         try:
             conn.transaction.discard()
-            return RespSimpleString('OK')
+            return RespOk
         except RuntimeError:
             return RespSimpleError('ERR DISCARD without MULTI')
 
@@ -29,10 +29,9 @@ class DiscardCommand(RedisCommand):
 @dataclass(frozen=True)
 class ExecCommand(RedisCommand):
     async def execute(self, conn: RedisConnection) -> RespValue:
-        try:
-            return await conn.transaction.execute()
-        except RuntimeError:
+        if not conn.transaction.active:
             return RespSimpleError('ERR EXEC without MULTI')
+        return await conn.transaction.execute()
 
     @classmethod
     def from_args(cls, args: List[bytes]) -> Self:
@@ -45,7 +44,7 @@ class ExecCommand(RedisCommand):
 class MultiCommand(RedisCommand):
     async def execute(self, conn: RedisConnection) -> RespValue:
         conn.transaction.start()
-        return RespSimpleString('OK')
+        return RespOk
 
     @classmethod
     def from_args(cls, args: List[bytes]) -> Self:
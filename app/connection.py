@@ -1,59 +1,108 @@
 import asyncio
+import itertools
+import weakref
+from abc import ABC, abstractmethod
+from collections import deque
 from types import TracebackType
-from typing import TYPE_CHECKING, List, Optional, Self, Tuple, Type
+from typing import TYPE_CHECKING, Any, Callable, Deque, List, Optional, Self, Tuple, Type
 
 from .database import RedisDatabase
-from .protocol import RespValue, resp_decode
+from .log import VERBOSE, logger
+from .protocol import Buffer, RespParser, RespValue
 from .transaction import RedisTransaction
 
 if TYPE_CHECKING:
     from .server import RedisServer
 
 
-class RedisConnection:
-    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, server: 'RedisServer') -> None:
-        self._reader = reader
-        self._writer = writer
+class RedisConnection(ABC):
+    def __init__(self, server: 'RedisServer') -> None:
         self._server = server
+        self._id = next(_client_ids)
+        _connections[self._id] = self
 
-        self._host, self._port, *_ = writer.get_extra_info('peername')
+        self._host, self._port = '', 0
         self._transaction = RedisTransaction(conn=self)
 
+        self._parser = RespParser()
+        self._parsed: Deque[RespValue] = deque()
+        self._pending_writes: List[Buffer] = []
+
+    @abstractmethod
     async def close(self) -> None:
-        self._writer.close()
-        await self._writer.wait_closed()
+        raise NotImplementedError
 
-    async def read_args(self) -> List[bytes]:
-        args = (await self.read_resp()).to_builtin()
+    @abstractmethod
+    async def flush(self) -> None:
+        raise NotImplementedError
 
-        if not isinstance(args, list) or not all(isinstance(arg, bytes) for arg in args):
-            raise RuntimeError('Command arguments must be sent as an array of bulk strings')
+    @abstractmethod
+    def flush_nowait(self) -> None:
+        raise NotImplementedError
+
+    async def read_args(self) -> List[bytes]:
+        await self._wait_parsed()
+        return _to_args(self._parsed.popleft())
 
-        return args
+    async def read_batch(self) -> List[List[bytes]]:
+        await self._wait_parsed()
+        batch = [_to_args(value) for value in self._parsed]
+        self._parsed.clear()
+        return batch
 
     async def read_rdb(self) -> None:
-        assert await self._reader.readexactly(1) == b'$'
-        length = int(await self._reader.readuntil(b'\r\n'))
-        await self._reader.readexactly(length)
+        while self._parser.parse_rdb() is None:
+            await self._fill()
 
     async def read_resp(self) -> RespValue:
-        return await resp_decode(self._reader)
+        if self._parsed:
+            return self._parsed.popleft()
 
-    async def write(self, data: bytes) -> None:
-        self._writer.write(data)
-        await self._writer.drain()
+        while (value := self._parser.parse_one()) is None:
+            await self._fill()
+        return value
+
+    def send(self, data: Buffer) -> None:
+        self._pending_writes.append(data)
+
+    def send_resp(self, value: RespValue) -> None:
+        value.encode_into(self._pending_writes)
+
+    async def write(self, data: Buffer) -> None:
+        self.send(data)
+        await self.flush()
 
     async def write_resp(self, value: RespValue) -> None:
-        await self.write(value.encode())
+        self.send_resp(value)
+        await self.flush()
+
+    @abstractmethod
+    async def _fill(self) -> None:
+        raise NotImplementedError
+
+    async def _wait_parsed(self) -> None:
+        self._parsed.extend(self._parser.parse())
+        while not self._parsed:
+            await self._fill()
+            self._parsed.extend(self._parser.parse())
 
     @property
     def addr(self) -> Tuple[str, int]:
         return self._host, self._port
 
+    @property
+    @abstractmethod
+    def closed(self) -> bool:
+        raise NotImplementedError
+
     @property
     def database(self) -> RedisDatabase:
         return self._server.get_database(0)
 
+    @property
+    def id(self) -> int:
+        return self._id
+
     @property
     def server(self) -> 'RedisServer':
         return self._server
@@ -69,8 +118,193 @@ class RedisConnection:
         await self.close()
 
         if exc_val is None:
-            print(f'Closed connection from {self.addr} normally')
+            logger.log(VERBOSE, 'Closed connection from %s normally', self.addr)
             return None
 
-        print(f'Closed connection from {self.addr} due to {exc_val!r}')
+        logger.log(VERBOSE, 'Closed connection from %s due to %r', self.addr, exc_val)
         return isinstance(exc_val, asyncio.IncompleteReadError)
+
+
+class RedisStreamConnection(RedisConnection):
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, server: 'RedisServer') -> None:
+        super().__init__(server)
+        self._reader = reader
+        self._writer = writer
+
+        self._host, self._port, *_ = writer.get_extra_info('peername')
+
+    async def close(self) -> None:
+        self._writer.close()
+        await self._writer.wait_closed()
+
+    async def flush(self) -> None:
+        if not self._pending_writes:
+            return
+
+        self.flush_nowait()
+        await self._writer.drain()
+
+    def flush_nowait(self) -> None:
+        if not self._pending_writes or self._writer.is_closing():
+            return
+
+        segments, self._pending_writes = self._pending_writes, []
+        self._writer.writelines(segments)
+
+    @property
+    def closed(self) -> bool:
+        return self._writer.is_closing()
+
+    async def _fill(self) -> None:
+        data = await self._reader.read(_READ_SIZE)
+        if not data:
+            raise asyncio.IncompleteReadError(b'', None)
+        self._parser.feed(data)
+
+
+class RedisProtocolConnection(RedisConnection, asyncio.Protocol):
+    def __init__(self, server: 'RedisServer', on_data: Callable[['RedisProtocolConnection'], None],
+                 on_close: Callable[['RedisProtocolConnection'], None]) -> None:
+        super().__init__(server)
+        self._on_data = on_data
+        self._on_close = on_close
+
+        self._transport: Optional[asyncio.Transport] = None
+        self._closed = False
+        self._busy = False
+        self._write_paused = False
+        self._fill_waiter: Optional[asyncio.Future[None]] = None
+        self._drain_waiters: List[asyncio.Future[None]] = []
+        self._task: Optional[asyncio.Task[Any]] = None
+
+    async def close(self) -> None:
+        self.close_nowait()
+
+    def close_nowait(self) -> None:
+        if self._transport is not None:
+            self._transport.close()
+
+    async def flush(self) -> None:
+        self.flush_nowait()
+        if self._write_paused and not self._closed:
+            waiter = asyncio.get_running_loop().create_future()
+            self._drain_waiters.append(waiter)
+            await waiter
+
+    def flush_nowait(self) -> None:
+        if not self._pending_writes or self._closed:
+            return
+
+        segments, self._pending_writes = self._pending_writes, []
+        self._transport.writelines(segments)
+
+    def next_args(self) -> Optional[List[bytes]]:
+        if not self._parsed:
+            self._parsed.extend(self._parser.parse())
+            if not self._parsed:
+                return None
+        return _to_args(self._parsed.popleft())
+
+    def run_in_task(self, coro: Any) -> None:
+        self._busy = True
+        self._update_reading()
+        self._task = asyncio.create_task(coro)
+        self._task.add_done_callback(self._task_done)
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self._transport = transport
+        self._host, self._port, *_ = transport.get_extra_info('peername')
+        logger.log(VERBOSE, 'Accepted connection from %s', self.addr)
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        self._closed = True
+        self._wake(self._drain_waiters)
+        if self._fill_waiter is not None and not self._fill_waiter.done():
+            self._fill_waiter.set_exception(asyncio.IncompleteReadError(b'', None))
+        if self._task is not None:
+            self._task.cancel()
+        self._on_close(self)
+
+        if exc is None:
+            logger.log(VERBOSE, 'Closed connection from %s normally', self.addr)
+        else:
+            logger.log(VERBOSE, 'Closed connection from %s due to %r', self.addr, exc)
+
+    def data_received(self, data: bytes) -> None:
+        self._parser.feed(data)
+
+        if self._fill_waiter is not None:
+            if not self._fill_waiter.done():
+                self._fill_waiter.set_result(None)
+        elif not self._busy:
+            self._on_data(self)
+
+    def pause_writing(self) -> None:
+        self._write_paused = True
+        self._update_reading()
+
+    def resume_writing(self) -> None:
+        self._write_paused = False
+        self._update_reading()
+        self._wake(self._drain_waiters)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    async def _fill(self) -> None:
+        if self._closed:
+            raise asyncio.IncompleteReadError(b'', None)
+
+        self._fill_waiter = asyncio.get_running_loop().create_future()
+        try:
+            await self._fill_waiter
+        finally:
+            self._fill_waiter = None
+
+    def _task_done(self, task: asyncio.Task[Any]) -> None:
+        self._task = None
+        self._busy = False
+        self._update_reading()
+
+        if not task.cancelled() and task.exception() is not None:
+            logger.log(VERBOSE, 'Closed connection from %s due to %r', self.addr, task.exception())
+            self.close_nowait()
+        elif not self._closed:
+            self._on_data(self)
+
+    def _update_reading(self) -> None:
+        if self._closed:
+            return
+
+        if self._busy or self._write_paused:
+            self._transport.pause_reading()
+        else:
+            self._transport.resume_reading()
+
+    @staticmethod
+    def _wake(waiters: List[asyncio.Future[None]]) -> None:
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+        waiters.clear()
+
+
+def get_connection(client_id: int) -> Optional[RedisConnection]:
+    conn = _connections.get(client_id)
+    return None if conn is None or conn.closed else conn
+
+
+def _to_args(value: RespValue) -> List[bytes]:
+    args = value.to_builtin()
+
+    if not isinstance(args, list) or not all(isinstance(arg, bytes) for arg in args):
+        raise RuntimeError('Command arguments must be sent as an array of bulk strings')
+
+    return args
+
+
+_READ_SIZE = 64 * 1024
+
+_client_ids = itertools.count(1)
+_connections: weakref.WeakValueDictionary[int, RedisConnection] = weakref.WeakValueDictionary()
@@ -5,16 +5,38 @@ __all__ = (
     'RedisSortedSet',
     'RedisStream',
     'RedisString',
+    'SortedList',
     'StreamEntry',
+    'TYPE_NAMES',
+    'set_listpack_limits',
+    'type_name',
 )
 
 
-from typing import TypeAlias, Union
+from typing import Dict, Optional, TypeAlias, Union
 
 from .list import RedisList
+from .sorted_list import SortedList
 from .sorted_set import RedisSortedSet
 from .stream import EntryId, RedisStream, StreamEntry
 from .string import RedisString
 
 
 RedisDataStruct: TypeAlias = Union[RedisList, RedisSortedSet, RedisStream, RedisString]
+
+TYPE_NAMES: Dict[type, str] = {
+    RedisString: 'string',
+    RedisList: 'list',
+    RedisSortedSet: 'zset',
+    RedisStream: 'stream',
+}
+
+
+def set_listpack_limits(*, list_max_size: int, zset_max_entries: int, zset_max_value: int) -> None:
+    RedisList.max_listpack_size = list_max_size
+    RedisSortedSet.max_listpack_entries = zset_max_entries
+    RedisSortedSet.max_listpack_value = zset_max_value
+
+
+def type_name(value: Optional[RedisDataStruct]) -> str:
+    return 'none' if value is None else TYPE_NAMES[type(value)]
@@ -1,27 +1,180 @@
-from typing import List, Optional, Union
+from collections import deque
+from itertools import islice
+from typing import ClassVar, Deque, Iterator, List, Optional, Union
+
+from .listpack import Listpack
 
 
 class RedisList:
+    max_listpack_size: ClassVar[int] = -2
+
     def __init__(self) -> None:
-        self._elements: List[bytes] = []
+        self._elements: Union[Listpack, Deque[bytes]] = Listpack()
+        self._nbytes = _LIST_OVERHEAD
+
+    def clear(self) -> None:
+        self._elements = Listpack()
+        self._nbytes = _LIST_OVERHEAD
+
+    @property
+    def encoding(self) -> str:
+        return 'listpack' if isinstance(self._elements, Listpack) else 'quicklist'
+
+    def get(self, index: int) -> Optional[bytes]:
+        index = self._normalize(index)
+        return None if index is None else self._elements[index]
+
+    def get_range(self, start: int, stop: int) -> Iterator[bytes]:
+        n = len(self._elements)
+        if start < 0:
+            start = max(start + n, 0)
+        if stop < 0:
+            stop += n
+        stop = min(stop, n - 1)
+        if start > stop:
+            return iter(())
+
+        if start <= n - 1 - stop:
+            return islice(self._elements, start, stop + 1)
+        return reversed(list(islice(reversed(self._elements), n - 1 - stop, n - start)))
+
+    def insert(self, pivot: bytes, element: bytes, after: bool = False) -> int:
+        try:
+            index = self._elements.index(pivot)
+        except ValueError:
+            return -1
 
-    def get_range(self, start: int, stop: int) -> List[bytes]:
-        if stop == -1:
-            return self._elements[start:]
-        return self._elements[start:stop+1]
+        self._elements.insert(index + 1 if after else index, element)
+        self._nbytes += len(element) + _ELEMENT_OVERHEAD
+        self._check_encoding()
+        return len(self._elements)
 
     def lpop(self, count: Optional[int] = None) -> Union[bytes, List[bytes]]:
         if count is None:
-            return self._elements.pop(0)
+            popped = self._elements.popleft()
+            self._nbytes -= len(popped) + _ELEMENT_OVERHEAD
+            return popped
 
-        popped, self._elements = self._elements[:count], self._elements[count:]
+        popleft = self._elements.popleft
+        popped = [popleft() for _ in range(min(count, len(self._elements)))]
+        self._nbytes -= _elements_nbytes(popped)
         return popped
 
     def lpush(self, elements: List[bytes]) -> None:
-        self._elements = elements[::-1] + self._elements
+        self._elements.extendleft(elements)
+        self._nbytes += _elements_nbytes(elements)
+        self._check_encoding()
+
+    @property
+    def nbytes(self) -> int:
+        if isinstance(self._elements, Listpack):
+            return self._elements.nbytes
+        return self._nbytes
+
+    def positions(self, element: bytes, rank: int = 1, count: int = 1, maxlen: int = 0) -> List[int]:
+        n = len(self._elements)
+        scanned = islice(self._elements, maxlen or None) if rank > 0 else islice(reversed(self._elements), maxlen or None)
+
+        found = []
+        skip = abs(rank) - 1
+        for i, e in enumerate(scanned):
+            if e != element:
+                continue
+            if skip:
+                skip -= 1
+                continue
+
+            found.append(i if rank > 0 else n - 1 - i)
+            if count and len(found) == count:
+                break
+        return found
+
+    def remove(self, element: bytes, count: int = 0) -> int:
+        limit = abs(count) or len(self._elements)
+        removed = 0
+        kept: List[bytes] = []
+        for e in (self._elements if count >= 0 else reversed(self._elements)):
+            if removed < limit and e == element:
+                removed += 1
+            else:
+                kept.append(e)
+
+        if count < 0:
+            kept.reverse()
+        self._elements.clear()
+        self._elements.extend(kept)
+        self._nbytes -= (len(element) + _ELEMENT_OVERHEAD) * removed
+        return removed
+
+    def rpop(self, count: Optional[int] = None) -> Union[bytes, List[bytes]]:
+        if count is None:
+            popped = self._elements.pop()
+            self._nbytes -= len(popped) + _ELEMENT_OVERHEAD
+            return popped
+
+        pop = self._elements.pop
+        popped = [pop() for _ in range(min(count, len(self._elements)))]
+        self._nbytes -= _elements_nbytes(popped)
+        return popped
 
     def rpush(self, elements: List[bytes]) -> None:
         self._elements.extend(elements)
+        self._nbytes += _elements_nbytes(elements)
+        self._check_encoding()
+
+    def set(self, index: int, element: bytes) -> bool:
+        index = self._normalize(index)
+        if index is None:
+            return False
+
+        self._nbytes += len(element) - len(self._elements[index])
+        self._elements[index] = element
+        self._check_encoding()
+        return True
+
+    def trim(self, start: int, stop: int) -> None:
+        n = len(self._elements)
+        if start < 0:
+            start = max(start + n, 0)
+        if stop < 0:
+            stop += n
+        stop = min(stop, n - 1)
+        if start > stop:
+            self.clear()
+            return
+
+        if start:
+            self.lpop(start)
+        if stop < n - 1:
+            self.rpop(n - 1 - stop)
+
+    def _check_encoding(self) -> None:
+        if not isinstance(self._elements, Listpack):
+            return
+
+        limit = self.max_listpack_size
+        if limit >= 0 and len(self._elements) > limit or limit < 0 and self._elements.nbytes > _listpack_max_bytes(limit):
+            self._elements = deque(self._elements)
+
+    def _normalize(self, index: int) -> Optional[int]:
+        n = len(self._elements)
+        if index < 0:
+            index += n
+        return index if 0 <= index < n else None
 
     def __len__(self) -> int:
         return len(self._elements)
+
+
+def _elements_nbytes(elements: List[bytes]) -> int:
+    return sum(map(len, elements)) + _ELEMENT_OVERHEAD * len(elements)
+
+
+def _listpack_max_bytes(limit: int) -> int:
+    return _LISTPACK_MIN_BYTES << (min(-limit, _LISTPACK_MAX_LEVEL) - 1)
+
+
+_ELEMENT_OVERHEAD = 41
+_LIST_OVERHEAD = 760
+_LISTPACK_MIN_BYTES = 4096
+_LISTPACK_MAX_LEVEL = 5
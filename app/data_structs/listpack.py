@@ -0,0 +1,107 @@
+__all__ = 'Listpack',
+
+
+import sys
+from array import array
+from itertools import accumulate, chain
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+
+_OVERHEAD = 48
+
+
+class Listpack:
+    def __init__(self, entries: Iterable[bytes] = ()) -> None:
+        self._data = bytearray()
+        self._lens = array('I')
+        self.extend(entries)
+
+    def append(self, entry: bytes) -> None:
+        self._data += entry
+        self._lens.append(len(entry))
+
+    def appendleft(self, entry: bytes) -> None:
+        self._data[:0] = entry
+        self._lens.insert(0, len(entry))
+
+    def clear(self) -> None:
+        self._data = bytearray()
+        self._lens = array('I')
+
+    def entries(self, start: int = 0, stop: Optional[int] = None) -> List[bytes]:
+        lens = self._lens[start:stop]
+        ends = list(accumulate(lens))
+        begin = self._offset(min(start, len(self._lens)))
+        data = bytes(self._data[begin:begin + (ends[-1] if ends else 0)])
+        return list(map(data.__getitem__, map(slice, chain((0,), ends), ends)))
+
+    def extend(self, entries: Iterable[bytes]) -> None:
+        entries = list(entries)
+        self._data += b''.join(entries)
+        self._lens.extend(map(len, entries))
+
+    def extendleft(self, entries: Iterable[bytes]) -> None:
+        entries = list(entries)
+        entries.reverse()
+        self._data[:0] = b''.join(entries)
+        self._lens[:0] = array('I', map(len, entries))
+
+    def index(self, entry: bytes) -> int:
+        return self.entries().index(entry)
+
+    def insert(self, index: int, entry: bytes) -> None:
+        n = len(self._lens)
+        index = min(max(index + n, 0) if index < 0 else index, n)
+        start = self._offset(index)
+        self._data[start:start] = entry
+        self._lens.insert(index, len(entry))
+
+    @property
+    def nbytes(self) -> int:
+        return sys.getsizeof(self._data) + sys.getsizeof(self._lens) + _OVERHEAD
+
+    def pop(self, index: int = -1) -> bytes:
+        start, end = self._span(index)
+        entry = bytes(self._data[start:end])
+        del self._data[start:end]
+        del self._lens[index]
+        return entry
+
+    def popleft(self) -> bytes:
+        return self.pop(0)
+
+    def _offset(self, index: int) -> int:
+        if index <= len(self._lens) // 2:
+            return sum(self._lens[:index])
+        return len(self._data) - sum(self._lens[index:])
+
+    def _span(self, index: int) -> Tuple[int, int]:
+        n = len(self._lens)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError('listpack index out of range')
+
+        start = self._offset(index)
+        return start, start + self._lens[index]
+
+    def __delitem__(self, index: int) -> None:
+        self.pop(index)
+
+    def __getitem__(self, index: int) -> bytes:
+        start, end = self._span(index)
+        return bytes(self._data[start:end])
+
+    def __iter__(self) -> Iterator[bytes]:
+        return iter(self.entries())
+
+    def __len__(self) -> int:
+        return len(self._lens)
+
+    def __reversed__(self) -> Iterator[bytes]:
+        return reversed(self.entries())
+
+    def __setitem__(self, index: int, entry: bytes) -> None:
+        start, end = self._span(index)
+        self._data[start:end] = entry
+        self._lens[index] = len(entry)
@@ -0,0 +1,223 @@
+__all__ = 'SortedList',
+
+
+from bisect import bisect_left, bisect_right, insort
+from itertools import chain
+from typing import Generic, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+
+_T = TypeVar('_T')
+
+_LOAD = 512
+
+
+class SortedList(Generic[_T]):
+    def __init__(self, values: Iterable[_T] = ()) -> None:
+        self._lists: List[List[_T]] = []
+        self._maxes: List[_T] = []
+        self._tree: Optional[List[int]] = None
+        self._len = 0
+
+        ordered = sorted(values)
+        for i in range(0, len(ordered), _LOAD):
+            chunk = ordered[i:i+_LOAD]
+            self._lists.append(chunk)
+            self._maxes.append(chunk[-1])
+        self._len = len(ordered)
+
+    def add(self, value: _T) -> None:
+        lists, maxes = self._lists, self._maxes
+        if not maxes:
+            lists.append([value])
+            maxes.append(value)
+            self._tree = None
+            self._len = 1
+            return
+
+        i = bisect_right(maxes, value)
+        if i == len(maxes):
+            i -= 1
+            lists[i].append(value)
+            maxes[i] = value
+        else:
+            insort(lists[i], value)
+
+        self._len += 1
+        self._tree_add(i, 1)
+        self._split_if_needed(i)
+
+    def bisect_left(self, value: _T) -> int:
+        i = bisect_left(self._maxes, value)
+        if i == len(self._maxes):
+            return self._len
+        return self._offset(i) + bisect_left(self._lists[i], value)
+
+    def bisect_right(self, value: _T) -> int:
+        i = bisect_right(self._maxes, value)
+        if i == len(self._maxes):
+            return self._len
+        return self._offset(i) + bisect_right(self._lists[i], value)
+
+    def discard(self, value: _T) -> bool:
+        i = bisect_left(self._maxes, value)
+        if i == len(self._maxes):
+            return False
+
+        chunk = self._lists[i]
+        j = bisect_left(chunk, value)
+        if chunk[j] != value:
+            return False
+
+        self._delete(i, j)
+        return True
+
+    def index(self, value: _T) -> int:
+        i = bisect_left(self._maxes, value)
+        if i < len(self._maxes):
+            chunk = self._lists[i]
+            j = bisect_left(chunk, value)
+            if chunk[j] == value:
+                return self._offset(i) + j
+        raise ValueError(f'{value!r} is not in list')
+
+    def islice(self, start: int, stop: int) -> Iterator[_T]:
+        start, stop = max(start, 0), min(stop, self._len)
+        if start >= stop:
+            return
+
+        i, j = self._locate(start)
+        remaining = stop - start
+        while remaining > 0:
+            part = self._lists[i][j:j+remaining]
+            yield from part
+            remaining -= len(part)
+            i, j = i + 1, 0
+
+    def islice_reversed(self, start: int, stop: int) -> Iterator[_T]:
+        start, stop = max(start, 0), min(stop, self._len)
+        if start >= stop:
+            return
+
+        i, j = self._locate(stop - 1)
+        remaining = stop - start
+        while remaining > 0:
+            chunk = self._lists[i]
+            lo = max(j + 1 - remaining, 0)
+            yield from reversed(chunk[lo:j+1])
+            remaining -= j + 1 - lo
+            i -= 1
+            j = len(self._lists[i]) - 1 if i >= 0 else 0
+
+    def pop(self, index: int = -1) -> _T:
+        i, j = self._locate(index)
+        value = self._lists[i][j]
+        self._delete(i, j)
+        return value
+
+    def remove(self, value: _T) -> None:
+        if not self.discard(value):
+            raise ValueError(f'{value!r} is not in list')
+
+    def __contains__(self, value: object) -> bool:
+        i = bisect_left(self._maxes, value)
+        if i == len(self._maxes):
+            return False
+        chunk = self._lists[i]
+        return chunk[bisect_left(chunk, value)] == value
+
+    def __getitem__(self, index: int) -> _T:
+        i, j = self._locate(index)
+        return self._lists[i][j]
+
+    def __iter__(self) -> Iterator[_T]:
+        return chain.from_iterable(self._lists)
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __reversed__(self) -> Iterator[_T]:
+        return chain.from_iterable(reversed(chunk) for chunk in reversed(self._lists))
+
+    def _build_tree(self) -> List[int]:
+        tree = [0] + [len(chunk) for chunk in self._lists]
+        for k in range(1, len(tree)):
+            parent = k + (k & -k)
+            if parent < len(tree):
+                tree[parent] += tree[k]
+        self._tree = tree
+        return tree
+
+    def _delete(self, i: int, j: int) -> None:
+        lists, maxes = self._lists, self._maxes
+        chunk = lists[i]
+        del chunk[j]
+        self._len -= 1
+
+        if not chunk:
+            del lists[i]
+            del maxes[i]
+            self._tree = None
+            return
+
+        maxes[i] = chunk[-1]
+        self._tree_add(i, -1)
+
+        if len(chunk) < _LOAD // 4 and len(lists) > 1:
+            k = i - 1 if i > 0 else i
+            lists[k] += lists[k+1]
+            maxes[k] = lists[k][-1]
+            del lists[k+1]
+            del maxes[k+1]
+            self._tree = None
+            self._split_if_needed(k)
+
+    def _locate(self, index: int) -> Tuple[int, int]:
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError('list index out of range')
+
+        if index < len(self._lists[0]):
+            return 0, index
+
+        tree = self._tree if self._tree is not None else self._build_tree()
+        pos = 0
+        step = 1 << (len(tree) - 1).bit_length()
+        while step:
+            nxt = pos + step
+            if nxt < len(tree) and tree[nxt] <= index:
+                pos = nxt
+                index -= tree[nxt]
+            step >>= 1
+        return pos, index
+
+    def _offset(self, i: int) -> int:
+        tree = self._tree if self._tree is not None else self._build_tree()
+        total = 0
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+    def _split_if_needed(self, i: int) -> None:
+        lists, maxes = self._lists, self._maxes
+        chunk = lists[i]
+        if len(chunk) <= 2 * _LOAD:
+            return
+
+        half = chunk[_LOAD:]
+        del chunk[_LOAD:]
+        maxes[i] = chunk[-1]
+        lists.insert(i + 1, half)
+        maxes.insert(i + 1, half[-1])
+        self._tree = None
+
+    def _tree_add(self, i: int, delta: int) -> None:
+        tree = self._tree
+        if tree is None:
+            return
+
+        k = i + 1
+        while k < len(tree):
+            tree[k] += delta
+            k += k & -k
@@ -1,42 +1,216 @@
-from typing import Dict, List, Tuple
+import math
+import struct
+from bisect import bisect_left, bisect_right
+from itertools import repeat
+from typing import ClassVar, Dict, Iterator, List, Optional, Tuple, Union
+
+from .listpack import Listpack
+from .sorted_list import SortedList
 
 
 class RedisSortedSet:
+    max_listpack_entries: ClassVar[int] = 128
+    max_listpack_value: ClassVar[int] = 64
+
     def __init__(self) -> None:
-        self._mem2score: Dict[bytes, float] = {}
+        self._mem2score: Optional[Dict[bytes, float]] = None
+        self._index: Union[_PackedIndex, SortedList[Tuple[float, bytes]]] = _PackedIndex()
+        self._nbytes = _ZSET_OVERHEAD
 
     def add(self, score_member_pairs: List[Tuple[float, bytes]]) -> int:
         added = 0
         for score, member in score_member_pairs:
-            if member not in self._mem2score:
+            old_score = self._score_of(member)
+            if old_score is None:
                 added += 1
-            self._mem2score[member] = score
+                self._nbytes += len(member) + _MEMBER_OVERHEAD
+            elif old_score == score:
+                continue
+            else:
+                self._index.remove((old_score, member))
+
+            self._index.add((score, member))
+            if self._mem2score is not None:
+                self._mem2score[member] = score
+            elif len(member) > self.max_listpack_value or len(self._index) > self.max_listpack_entries:
+                self._convert()
         return added
 
-    def get_range(self, start: int, stop: int) -> List[bytes]:
-        sorted_members = self._sort_members()
-        if stop == -1:
-            return sorted_members[start:]
-        return sorted_members[start:stop+1]
+    @property
+    def encoding(self) -> str:
+        return 'listpack' if self._mem2score is None else 'skiplist'
 
-    def get_rank(self, member: bytes) -> int:
-        return self._sort_members().index(member)
+    def get_range(self, start: int, stop: int, reverse: bool = False) -> Iterator[Tuple[float, bytes]]:
+        start, stop = self.normalize_range(start, stop)
+        n = len(self._index)
+        if reverse:
+            return self.get_slice(n - stop, n - start, reverse=True)
+        return self.get_slice(start, stop)
+
+    def get_rank(self, member: bytes, reverse: bool = False) -> int:
+        rank = self._index.index((self.get_score(member), member))
+        return len(self._index) - 1 - rank if reverse else rank
+
+    def get_slice(self, start: int, stop: int, reverse: bool = False) -> Iterator[Tuple[float, bytes]]:
+        if reverse:
+            return self._index.islice_reversed(start, stop)
+        return self._index.islice(start, stop)
 
     def get_score(self, member: bytes) -> float:
-        try:
-            return self._mem2score[member]
-        except KeyError:
+        score = self._score_of(member)
+        if score is None:
             raise ValueError
+        return score
+
+    def incr(self, member: bytes, increment: float) -> float:
+        score = self._score_of(member)
+        score = (0.0 if score is None else score) + increment
+        if math.isnan(score):
+            raise ValueError
+        self.add([(score, member)])
+        return score
+
+    def lex_rank(self, member: bytes, after: bool = False) -> int:
+        if not self._index:
+            return 0
+        score = self._index[0][0]
+        return self._index.bisect_right((score, member)) if after else self._index.bisect_left((score, member))
+
+    @property
+    def nbytes(self) -> int:
+        if self._mem2score is None:
+            return self._index.nbytes
+        return self._nbytes
+
+    def normalize_range(self, start: int, stop: int) -> Tuple[int, int]:
+        n = len(self._index)
+        if start < 0:
+            start = max(start + n, 0)
+        if stop < 0:
+            stop += n
+        stop = min(stop, n - 1)
+        return (start, stop + 1) if start <= stop else (0, 0)
+
+    def pop(self, count: int = 1, reverse: bool = False) -> List[Tuple[float, bytes]]:
+        index = -1 if reverse else 0
+        return [self._pop_at(index) for _ in range(min(count, len(self._index)))]
 
     def remove(self, members: List[bytes]) -> int:
         removed = 0
         for member in members:
-            if self._mem2score.pop(member, None) is not None:
+            score = self._score_of(member)
+            if score is not None:
+                self._index.remove((score, member))
+                if self._mem2score is not None:
+                    del self._mem2score[member]
                 removed += 1
+                self._nbytes -= len(member) + _MEMBER_OVERHEAD
+        return removed
+
+    def remove_slice(self, start: int, stop: int) -> int:
+        removed = max(stop - start, 0)
+        for _ in range(removed):
+            self._pop_at(start)
         return removed
 
-    def _sort_members(self) -> List[bytes]:
-        return [m for m, _ in sorted(self._mem2score.items(), key=lambda x: x[::-1])]
+    def score_rank(self, score: float, after: bool = False) -> int:
+        if after:
+            if score == math.inf:
+                return len(self._index)
+            score = math.nextafter(score, math.inf)
+        return self._index.bisect_left((score,))
+
+    def _convert(self) -> None:
+        entries = list(self._index)
+        self._index = SortedList(entries)
+        self._mem2score = {member: score for score, member in entries}
+
+    def _pop_at(self, index: int) -> Tuple[float, bytes]:
+        score, member = self._index.pop(index)
+        if self._mem2score is not None:
+            del self._mem2score[member]
+        self._nbytes -= len(member) + _MEMBER_OVERHEAD
+        return score, member
+
+    def _score_of(self, member: bytes) -> Optional[float]:
+        if self._mem2score is None:
+            return self._index.score_of(member)
+        return self._mem2score.get(member)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+
+class _PackedIndex:
+    def __init__(self) -> None:
+        self._entries = Listpack()
+
+    def add(self, value: Tuple[float, bytes]) -> None:
+        key = _pack_entry(value)
+        self._entries.insert(bisect_left(self._entries.entries(), key), key)
+
+    def bisect_left(self, value: Tuple) -> int:
+        return bisect_left(self._entries.entries(), _pack_entry(value))
+
+    def bisect_right(self, value: Tuple) -> int:
+        return bisect_right(self._entries.entries(), _pack_entry(value))
+
+    def index(self, value: Tuple[float, bytes]) -> int:
+        return self._entries.index(_pack_entry(value))
+
+    def islice(self, start: int, stop: int) -> Iterator[Tuple[float, bytes]]:
+        return map(_unpack_entry, self._entries.entries(start, stop))
+
+    def islice_reversed(self, start: int, stop: int) -> Iterator[Tuple[float, bytes]]:
+        return map(_unpack_entry, reversed(self._entries.entries(start, stop)))
+
+    @property
+    def nbytes(self) -> int:
+        return self._entries.nbytes
+
+    def pop(self, index: int = -1) -> Tuple[float, bytes]:
+        return _unpack_entry(self._entries.pop(index))
+
+    def remove(self, value: Tuple[float, bytes]) -> None:
+        del self._entries[self.index(value)]
+
+    def score_of(self, member: bytes) -> Optional[float]:
+        entries = self._entries.entries()
+        try:
+            index = list(map(bytes.__getitem__, entries, repeat(_MEMBER_SLICE))).index(member)
+        except ValueError:
+            return None
+        return _unpack_entry(entries[index])[0]
+
+    def __getitem__(self, index: int) -> Tuple[float, bytes]:
+        return _unpack_entry(self._entries[index])
+
+    def __iter__(self) -> Iterator[Tuple[float, bytes]]:
+        return map(_unpack_entry, self._entries)
 
     def __len__(self) -> int:
-        return len(self._mem2score)
+        return len(self._entries)
+
+
+def _pack_entry(value: Tuple) -> bytes:
+    bits, = _UINT64.unpack(_DOUBLE.pack(value[0] + 0.0))
+    bits ^= _ALL_BITS if bits & _SIGN_BIT else _SIGN_BIT
+    return _UINT64.pack(bits) + (value[1] if len(value) > 1 else b'')
+
+
+def _unpack_entry(entry: bytes) -> Tuple[float, bytes]:
+    bits, = _UINT64.unpack_from(entry)
+    bits ^= _SIGN_BIT if bits & _SIGN_BIT else _ALL_BITS
+    score, = _DOUBLE.unpack(_UINT64.pack(bits))
+    return score, entry[_SCORE_SIZE:]
+
+
+_DOUBLE = struct.Struct('>d')
+_UINT64 = struct.Struct('>Q')
+_SCORE_SIZE = _UINT64.size
+_MEMBER_SLICE = slice(_SCORE_SIZE, None)
+_SIGN_BIT = 1 << 63
+_ALL_BITS = (1 << 64) - 1
+
+_MEMBER_OVERHEAD = 200
+_ZSET_OVERHEAD = 120
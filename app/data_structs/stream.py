@@ -30,6 +30,7 @@ class RedisStream:
     def __init__(self) -> None:
         self._entries: List[StreamEntry] = []
         self._max_seq_nums: dict[int, int] = {}
+        self._nbytes = _STREAM_OVERHEAD
 
     def add(self, entry_id: EntryId, fvpairs: List[Tuple[bytes, bytes]]) -> None:
         if self._entries and entry_id <= self._entries[-1].id:
@@ -37,6 +38,7 @@ class RedisStream:
 
         self._max_seq_nums[entry_id.ms_time] = entry_id.seq_num
         self._entries.append(StreamEntry(entry_id, OrderedDict(fvpairs)))
+        self._nbytes += _ENTRY_OVERHEAD + sum(len(f) + len(v) + _FIELD_OVERHEAD for f, v in fvpairs)
 
     def auto_gen_next_id(self, ms_time: Optional[int] = None) -> EntryId:
         if ms_time is None:
@@ -52,9 +54,25 @@ class RedisStream:
             seq_num = max_seq_num + 1
         return EntryId(ms_time, seq_num)
 
+    @property
+    def encoding(self) -> str:
+        return 'stream'
+
     def get_range(self, start_id: EntryId, end_id: EntryId) -> List[StreamEntry]:
         return [e for e in self._entries if start_id <= e.id < end_id]
 
+    @property
+    def nbytes(self) -> int:
+        return self._nbytes
+
     def read(self, start_id: EntryId) -> List[StreamEntry]:
         i = bisect_left(self._entries, start_id, key=lambda e: e.id)
         return self._entries[i:]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_ENTRY_OVERHEAD = 200
+_FIELD_OVERHEAD = 140
+_STREAM_OVERHEAD = 120
@@ -1,11 +1,114 @@
+import math
+import sys
+from decimal import Decimal
+from typing import Union
+
+from ..protocol import Buffer
+
+
 class RedisString:
-    def __init__(self, value: bytes) -> None:
-        self._seq = bytearray(value)
+    def __init__(self, value: Union[bytes, int]) -> None:
+        self._value: Union[int, bytes, bytearray] = _encode(value)
+
+    def append(self, data: bytes) -> int:
+        value = self._mutable()
+        value += data
+        return len(value)
+
+    @property
+    def encoding(self) -> str:
+        if isinstance(self._value, int):
+            return 'int'
+        elif isinstance(self._value, bytearray):
+            return 'raw'
+        return 'embstr' if len(self._value) <= _EMBSTR_MAX_LEN else 'raw'
+
+    def get_range(self, start: int, end: int) -> Buffer:
+        n = len(self)
+        if start < 0:
+            start = max(start + n, 0)
+        if end < 0:
+            end = max(end + n, 0)
+        end = min(end, n - 1)
+        if start > end:
+            return b''
+
+        if isinstance(self._value, bytearray):
+            return bytes(self._value[start:end + 1])
+        return memoryview(self.to_bytes())[start:end + 1]
+
+    def incr(self, increment: int = 1) -> int:
+        value = self._value if isinstance(self._value, int) else _encode(bytes(self._value))
+        if not isinstance(value, int):
+            raise ValueError
+
+        result = value + increment
+        if not _INT_MIN <= result <= _INT_MAX:
+            raise OverflowError
+        self._value = result
+        return result
+
+    def incr_float(self, increment: float) -> bytes:
+        result = float(self.to_bytes()) + increment
+        if not math.isfinite(result):
+            raise OverflowError
+
+        self._value = _format_float(result)
+        return self._value
 
-    def incr(self) -> int:
-        new = int(self._seq) + 1
-        self._seq = bytearray(str(new).encode())
-        return new
+    @property
+    def nbytes(self) -> int:
+        return sys.getsizeof(self._value)
+
+    def set_range(self, offset: int, data: bytes) -> int:
+        value = self._mutable()
+        end = offset + len(data)
+        if end > len(value):
+            value += bytes(end - len(value))
+        value[offset:end] = data
+        return len(value)
 
     def to_bytes(self) -> bytes:
-        return bytes(self._seq)
+        value = self._value
+        if isinstance(value, bytes):
+            return value
+        elif isinstance(value, int):
+            return str(value).encode()
+        return bytes(value)
+
+    def _mutable(self) -> bytearray:
+        if not isinstance(self._value, bytearray):
+            self._value = bytearray(self.to_bytes())
+        return self._value
+
+    def __len__(self) -> int:
+        if isinstance(self._value, int):
+            return len(str(self._value))
+        return len(self._value)
+
+
+def _encode(value: Union[bytes, int]) -> Union[int, bytes]:
+    if isinstance(value, int):
+        return value
+
+    if len(value) <= _MAX_INT_LEN and value[-1:].isdigit():
+        try:
+            n = int(value)
+        except ValueError:
+            pass
+        else:
+            if _INT_MIN <= n <= _INT_MAX and str(n).encode() == value:
+                return n
+    return value if type(value) is bytes else bytes(value)
+
+
+def _format_float(value: float) -> bytes:
+    if value.is_integer():
+        return str(int(value)).encode()
+    return format(Decimal(repr(value)), 'f').encode()
+
+
+_INT_MIN = -2 ** 63
+_INT_MAX = 2 ** 63 - 1
+_MAX_INT_LEN = 20
+_EMBSTR_MAX_LEN = 44
@@ -1,6 +1,8 @@
-__all__ = 'RedisDatabase', 'Expiry', 'rdb_parse'
+__all__ = 'EVICTION_POLICIES', 'LazyFreer', 'RedisDatabase', 'expiry_from_kwargs', 'now_ms', 'rdb_parse'
 
 
 from .database import RedisDatabase
-from .expiry import Expiry
+from .eviction import EVICTION_POLICIES
+from .expiry import expiry_from_kwargs, now_ms
+from .lazyfree import LazyFreer
 from .rdb_parser import rdb_parse
@@ -1,49 +1,235 @@
 import asyncio
+import heapq
+import random
+import time
+from collections import defaultdict, deque
 from dataclasses import dataclass
-from typing import Callable, Dict, List, Optional
+from itertools import takewhile
+from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, List, Optional, Tuple, TypeVar
 
-from ..data_structs import RedisDataStruct
+from ..data_structs import RedisDataStruct, RedisString, SortedList
 
-from .expiry import Expiry
+from .eviction import lfu_counter, lfu_init, lfu_touch, lru_clock, lru_idle
+from .expiry import now_ms
+from .lazyfree import LazyFreer
 
+if TYPE_CHECKING:
+    from ..tracking import TrackingTable
 
-@dataclass
-class _ValueWithExpiry:
-    value: RedisDataStruct
-    expiry: Optional[Expiry] = None
+
+_T = TypeVar('_T')
+
+
+@dataclass(eq=False)
+class _Waiter:
+    keys: List[bytes]
+    serve: Callable[[bytes], Optional[Any]]
+    future: asyncio.Future[Optional[Any]]
+    serving: bool = False
 
 
 class RedisDatabase:
     def __init__(self) -> None:
-        self._kv: Dict[bytes, _ValueWithExpiry] = {}
+        self._kv: Dict[bytes, RedisDataStruct] = {}
+        self._expires: Dict[bytes, int] = {}
+        self._expiry_index: List[Tuple[int, bytes]] = []
+        self._key_index: SortedList[bytes] = SortedList()
+        self._scan_index: SortedList[Tuple[int, bytes]] = SortedList()
+        self._meta: Dict[bytes, int] = {}
+        self._type_bytes: Dict[type, int] = defaultdict(int)
+        self._type_keys: Dict[type, int] = defaultdict(int)
+        self._waiters: Dict[bytes, Deque[_Waiter]] = {}
+        self._lazyfree: Optional[LazyFreer] = None
+        self._tracking: Optional['TrackingTable'] = None
+        self._lfu = False
+        self._track_access = False
+
+        self.expired_keys = 0
+        self.used_memory = 0
+
+    def delete(self, key: bytes, lazy: bool = False) -> bool:
+        if not self.exists(key):
+            return False
+
+        value = self._kv.pop(key)
+        self._untrack(key, value)
+        self._expires.pop(key, None)
+        if lazy:
+            self._release(value)
+        self._invalidate(key)
+        return True
+
+    def eviction_candidate(self, policy: str, samples: int) -> Optional[Tuple[int, bytes]]:
+        best = None
+        for key in self._sample_keys(policy.startswith('volatile-'), samples):
+            score = self._eviction_score(key, policy)
+            if best is None or score > best[0]:
+                best = score, key
+        return best
+
+    def exists(self, key: bytes) -> bool:
+        if self._tracking is not None:
+            self._tracking.on_read(key)
 
-        self._lock = asyncio.Lock()
-        self._conds: Dict[bytes, asyncio.Condition] = {}
+        if key not in self._kv:
+            return False
 
-    def delete(self, key: bytes) -> None:
-        self._kv.pop(key, None)
-        self._conds.pop(key, None)
+        if self._expires and self._has_expired(key):
+            self._expire(key)
+            return False
+        return True
+
+    def flush(self, lazy: bool = False) -> None:
+        keyspace = self._kv, self._expires, self._expiry_index, self._key_index, self._scan_index, self._meta
+        count = len(self._kv)
+
+        self._kv = {}
+        self._expires = {}
+        self._expiry_index = []
+        self._key_index = SortedList()
+        self._scan_index = SortedList()
+        self._meta = {}
+        self._type_bytes.clear()
+        self._type_keys.clear()
+        self.used_memory = 0
+
+        if lazy and self._lazyfree is not None:
+            self._lazyfree.free(keyspace, count)
+        if self._tracking is not None:
+            self._tracking.invalidate_all()
 
     def get(self, key: bytes) -> Optional[RedisDataStruct]:
-        v = self._kv.get(key)
-        if v is None:
+        if self._tracking is not None:
+            self._tracking.on_read(key)
+
+        value = self._kv.get(key)
+        if value is None:
             return None
 
-        if v.expiry is not None and v.expiry.has_passed():
-            del self._kv[key]
+        if self._expires and self._has_expired(key):
+            self._expire(key)
+            return None
+
+        if self._track_access:
+            self._touch(key)
+        return value
+
+    def get_expiry(self, key: bytes) -> Optional[int]:
+        return self._expires.get(key)
+
+    def expire_cycle(self, deadline: float) -> bool:
+        index = self._expiry_index
+        now = now_ms()
+        checked = 0
+
+        while index and index[0][0] <= now:
+            when, key = heapq.heappop(index)
+            if self._expires.get(key) == when:
+                self._expire(key)
+
+            checked += 1
+            if checked % _EXPIRE_CHECK_INTERVAL == 0 and time.perf_counter() >= deadline:
+                break
+
+        if len(index) > 2 * len(self._expires) + _EXPIRY_INDEX_SLACK:
+            self._rebuild_expiry_index()
+
+        return not index or index[0][0] > now
+
+    def keys(self, prefix: bytes = b'') -> List[bytes]:
+        if prefix:
+            index = self._key_index
+            start = index.bisect_left(prefix)
+            keys = list(takewhile(lambda k: k.startswith(prefix), index.islice(start, len(index))))
+        else:
+            keys = list(self._kv)
+
+        if not self._expires:
+            return keys
+        return [k for k in keys if not self._has_expired(k)]
+
+    def memory_stats(self) -> Dict[type, Tuple[int, int]]:
+        return {t: (self._type_keys[t], self._type_bytes[t]) for t in self._type_keys if self._type_keys[t]}
+
+    def memory_usage(self, key: bytes) -> Optional[int]:
+        if self.get(key) is None:
             return None
+        return self._meta[key] >> _META_SIZE_SHIFT
 
-        return v.value
+    def persist(self, key: bytes) -> bool:
+        return self._expires.pop(key, None) is not None
 
-    def keys(self) -> List[bytes]:
-        return [k for k, v in self._kv.items() if v.expiry is None or not v.expiry.has_passed()]
+    def signal_modified(self, key: bytes) -> None:
+        value = self._kv.get(key)
+        if value is not None:
+            self._account(key, value)
+        self._invalidate(key)
 
     def notify(self, key: bytes) -> None:
-        cond = self._get_cond(key)
-        cond.notify_all()
+        waiters = self._waiters.get(key)
+        if waiters is None:
+            return
+
+        for waiter in list(waiters):
+            if self.get(key) is None:
+                break
+
+            if waiter.serving or waiter.future.done():
+                continue
+
+            waiter.serving = True
+            try:
+                result = waiter.serve(key)
+            finally:
+                waiter.serving = False
+
+            if result is not None:
+                self._wake(waiter, result)
+
+    def scan(self, cursor: int, count: int) -> Tuple[int, List[bytes]]:
+        index = self._scan_index
+        start = index.bisect_left((cursor,))
+        entries = list(index.islice(start, start + count))
+        if not entries:
+            return 0, []
 
-    def set(self, key: bytes, value: RedisDataStruct, expiry: Optional[Expiry] = None) -> None:
-        self._kv[key] = _ValueWithExpiry(value, expiry)
+        stop = index.bisect_right((entries[-1][0] + 1,))
+        if stop > start + count:
+            entries += index.islice(start + count, stop)
+
+        next_cursor = index[stop][0] if stop < len(index) else 0
+        return next_cursor, [key for _, key in entries]
+
+    def set(self, key: bytes, value: RedisDataStruct, expiry: Optional[int] = None) -> None:
+        old_value = self._kv.get(key)
+        if old_value is None:
+            self._key_index.add(key)
+            self._scan_index.add(_scan_entry(key))
+        elif type(old_value) is not type(value):
+            self._unaccount(key, old_value)
+        self._kv[key] = value
+        self._account(key, value)
+        if old_value is not None and old_value is not value:
+            self._release(old_value)
+        self._invalidate(key)
+        if expiry is None:
+            self._expires.pop(key, None)
+        else:
+            self.set_expiry(key, expiry)
+
+    def set_lazyfree(self, lazyfree: LazyFreer) -> None:
+        self._lazyfree = lazyfree
+
+    def set_tracking(self, tracking: 'TrackingTable') -> None:
+        self._tracking = tracking
+
+    def set_expiry(self, key: bytes, expiry: int) -> None:
+        self._expires[key] = expiry
+        heapq.heappush(self._expiry_index, (expiry, key))
+
+    def set_eviction_policy(self, policy: str) -> None:
+        self._lfu = policy.endswith('-lfu')
+        self._track_access = self._lfu or policy.endswith('-lru')
 
     def setdefault(self, key: bytes, default: RedisDataStruct) -> RedisDataStruct:
         value = self.get(key)
@@ -53,23 +239,138 @@ class RedisDatabase:
         self.set(key, default)
         return default
 
-    async def wait_for(self, key: bytes, predicate: Callable[[RedisDataStruct], bool], *, timeout: float = 0.0) -> Optional[RedisDataStruct]:
-        cond = self._get_cond(key)
-        delay = timeout if timeout else None
+    async def wait_for(self, keys: List[bytes], serve: Callable[[bytes], Optional[_T]], *, timeout: float = 0.0) -> Optional[_T]:
+        if self._tracking is not None:
+            self._tracking.end_command()
 
+        loop = asyncio.get_running_loop()
+        waiter = _Waiter(keys, serve, loop.create_future())
+        for key in keys:
+            self._waiters.setdefault(key, deque()).append(waiter)
+
+        timer = loop.call_later(timeout, self._wake, waiter, None) if timeout else None
         try:
-            async with asyncio.timeout(delay):
-                while True:
-                    value = self.get(key)
-                    if value is not None and predicate(value):
-                        return value
-                    await cond.wait()
-        except TimeoutError:
-            return None
+            return await waiter.future
+        finally:
+            if timer is not None:
+                timer.cancel()
+            self._remove_waiter(waiter)
+
+    def _account(self, key: bytes, value: RedisDataStruct) -> None:
+        size = len(key) + _KEY_OVERHEAD + value.nbytes
+        meta = self._meta.get(key)
+        if meta is None:
+            delta = size
+            field = lfu_init() if self._lfu else lru_clock()
+            self._type_keys[type(value)] += 1
+        else:
+            delta = size - (meta >> _META_SIZE_SHIFT)
+            field = meta & _META_FIELD_MASK if self._lfu else lru_clock()
+
+        self.used_memory += delta
+        self._type_bytes[type(value)] += delta
+        self._meta[key] = (size << _META_SIZE_SHIFT) | field
+
+    def _eviction_score(self, key: bytes, policy: str) -> int:
+        field = self._meta[key] & _META_FIELD_MASK
+        if policy.endswith('-lru'):
+            return lru_idle(field)
+        elif policy.endswith('-lfu'):
+            return 255 - lfu_counter(field)
+        elif policy == 'volatile-ttl':
+            return -self._expires[key]
+        return 0
+
+    def _expire(self, key: bytes) -> None:
+        value = self._kv.pop(key)
+        del self._expires[key]
+        self._untrack(key, value)
+        self._release(value)
+        self._invalidate(key)
+        self.expired_keys += 1
+
+    def _has_expired(self, key: bytes) -> bool:
+        expiry = self._expires.get(key)
+        return expiry is not None and expiry <= now_ms()
+
+    def _invalidate(self, key: bytes) -> None:
+        if self._tracking is not None:
+            self._tracking.invalidate(key)
+
+    def _rebuild_expiry_index(self) -> None:
+        self._expiry_index = [(expiry, key) for key, expiry in self._expires.items()]
+        heapq.heapify(self._expiry_index)
+
+    def _release(self, value: RedisDataStruct) -> None:
+        if self._lazyfree is not None and _free_effort(value) > self._lazyfree.threshold:
+            self._lazyfree.free(value)
+
+    def _remove_waiter(self, waiter: _Waiter) -> None:
+        for key in waiter.keys:
+            waiters = self._waiters.get(key)
+            if waiters is None:
+                continue
+
+            try:
+                waiters.remove(waiter)
+            except ValueError:
+                continue
+
+            if not waiters:
+                del self._waiters[key]
+
+    def _sample_keys(self, volatile: bool, samples: int) -> List[bytes]:
+        if not volatile:
+            index = self._key_index
+            return [index[random.randrange(len(index))] for _ in range(samples)] if index else []
+
+        if len(self._expiry_index) > 2 * len(self._expires):
+            self._rebuild_expiry_index()
+
+        index = self._expiry_index
+        keys: List[bytes] = []
+        for _ in range(_VOLATILE_SAMPLE_ATTEMPTS * samples):
+            if not index or len(keys) == samples:
+                break
+            when, key = index[random.randrange(len(index))]
+            if self._expires.get(key) == when:
+                keys.append(key)
+        return keys
+
+    def _touch(self, key: bytes) -> None:
+        meta = self._meta[key]
+        field = lfu_touch(meta & _META_FIELD_MASK) if self._lfu else lru_clock()
+        self._meta[key] = (meta & ~_META_FIELD_MASK) | field
+
+    def _unaccount(self, key: bytes, value: RedisDataStruct) -> None:
+        size = self._meta.pop(key) >> _META_SIZE_SHIFT
+        self.used_memory -= size
+        self._type_bytes[type(value)] -= size
+        self._type_keys[type(value)] -= 1
+
+    def _untrack(self, key: bytes, value: RedisDataStruct) -> None:
+        self._key_index.remove(key)
+        self._scan_index.remove(_scan_entry(key))
+        self._unaccount(key, value)
+
+    def _wake(self, waiter: _Waiter, result: Optional[Any]) -> None:
+        self._remove_waiter(waiter)
+        if not waiter.future.done():
+            waiter.future.set_result(result)
+
+
+def _free_effort(value: RedisDataStruct) -> int:
+    return 1 if isinstance(value, RedisString) else len(value)
+
+
+def _scan_entry(key: bytes) -> Tuple[int, bytes]:
+    return hash(key) & _SCAN_HASH_MASK, key
 
-    @property
-    def lock(self) -> asyncio.Lock:
-        return self._lock
 
-    def _get_cond(self, key: bytes) -> asyncio.Condition:
-        return self._conds.setdefault(key, asyncio.Condition(self._lock))
+_EXPIRE_CHECK_INTERVAL = 16
+_EXPIRY_INDEX_SLACK = 1024
+_KEY_OVERHEAD = 160
+_META_FIELD_MASK = 0xFFFFFF
+_META_SIZE_SHIFT = 24
+_SCAN_HASH_MASK = 0xFFFF_FFFF_FFFF_FFFF
+_VOLATILE_SAMPLE_ATTEMPTS = 4
@@ -0,0 +1,56 @@
+__all__ = ('EVICTION_POLICIES', 'lfu_counter', 'lfu_init', 'lfu_touch', 'lru_clock', 'lru_idle')
+
+
+import random
+
+from .expiry import now_ms
+
+
+EVICTION_POLICIES = (
+    'allkeys-lfu',
+    'allkeys-lru',
+    'allkeys-random',
+    'noeviction',
+    'volatile-lfu',
+    'volatile-lru',
+    'volatile-random',
+    'volatile-ttl',
+)
+
+_CLOCK_MASK = 0xFFFFFF
+_LFU_TIME_MASK = 0xFFFF
+_LFU_COUNTER_MAX = 255
+_LFU_INIT_VAL = 5
+_LFU_LOG_FACTOR = 10
+_LFU_DECAY_MINUTES = 1
+
+
+def lru_clock() -> int:
+    return (now_ms() // 1000) & _CLOCK_MASK
+
+
+def lru_idle(field: int) -> int:
+    return (lru_clock() - field) & _CLOCK_MASK
+
+
+def lfu_init() -> int:
+    return (_lfu_minutes() << 8) | _LFU_INIT_VAL
+
+
+def lfu_counter(field: int) -> int:
+    counter = field & 0xFF
+    elapsed = (_lfu_minutes() - (field >> 8)) & _LFU_TIME_MASK
+    return max(counter - elapsed // _LFU_DECAY_MINUTES, 0)
+
+
+def lfu_touch(field: int) -> int:
+    counter = lfu_counter(field)
+    if counter < _LFU_COUNTER_MAX:
+        baseval = max(counter - _LFU_INIT_VAL, 0)
+        if random.random() < 1.0 / (baseval * _LFU_LOG_FACTOR + 1):
+            counter += 1
+    return (_lfu_minutes() << 8) | counter
+
+
+def _lfu_minutes() -> int:
+    return (now_ms() // 60_000) & _LFU_TIME_MASK
@@ -1,17 +1,40 @@
-from datetime import datetime, timedelta
-from typing import Optional, Self
-
-
-class Expiry(datetime):
-    @classmethod
-    def from_kwargs(cls, *, px: Optional[int] = None, exat: Optional[int] = None, pxat: Optional[int] = None) -> Optional[Self]:
-        if px is not None:
-            return cls.now() + timedelta(milliseconds=px)
-        elif exat is not None:
-            return cls.fromtimestamp(exat)
-        elif pxat is not None:
-            return cls.fromtimestamp(pxat / 1000)
-        return None
-
-    def has_passed(self) -> bool:
-        return self <= self.now()
+import asyncio
+import time
+from typing import Optional
+
+
+_cached_ms: Optional[int] = None
+
+
+def now_ms() -> int:
+    global _cached_ms
+
+    if _cached_ms is not None:
+        return _cached_ms
+
+    ms = time.time_ns() // 1_000_000
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return ms
+
+    _cached_ms = ms
+    loop.call_soon(_invalidate_cached_ms)
+    return ms
+
+
+def expiry_from_kwargs(*, ex: Optional[int] = None, px: Optional[int] = None, exat: Optional[int] = None, pxat: Optional[int] = None) -> Optional[int]:
+    if ex is not None:
+        return now_ms() + ex * 1000
+    elif px is not None:
+        return now_ms() + px
+    elif exat is not None:
+        return exat * 1000
+    elif pxat is not None:
+        return pxat
+    return None
+
+
+def _invalidate_cached_ms() -> None:
+    global _cached_ms
+    _cached_ms = None
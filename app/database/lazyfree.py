@@ -0,0 +1,58 @@
+__all__ = 'LazyFreer',
+
+
+import asyncio
+import queue
+import threading
+from typing import Any, List, Optional, Tuple
+
+
+class LazyFreer:
+    def __init__(self, threshold: int = 64) -> None:
+        self.threshold = threshold
+        self._queue: queue.SimpleQueue[Tuple[List[Any], int]] = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._batch: List[Any] = []
+        self._batch_count = 0
+        self._pending = 0
+        self._freed = 0
+
+    def free(self, obj: Any, count: int = 1) -> None:
+        with self._lock:
+            self._pending += count
+
+        self._batch.append(obj)
+        self._batch_count += count
+        if len(self._batch) > 1:
+            return
+
+        try:
+            asyncio.get_running_loop().call_soon(self._submit)
+        except RuntimeError:
+            self._submit()
+
+    @property
+    def freed_objects(self) -> int:
+        return self._freed
+
+    @property
+    def pending_objects(self) -> int:
+        return self._pending
+
+    def _run(self) -> None:
+        while True:
+            batch, count = self._queue.get()
+            batch.clear()
+            with self._lock:
+                self._pending -= count
+                self._freed += count
+
+    def _submit(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='lazyfree', daemon=True)
+            self._thread.start()
+
+        self._queue.put((self._batch, self._batch_count))
+        self._batch = []
+        self._batch_count = 0
@@ -6,7 +6,7 @@ from typing import List, Optional, Self, Type
 from ..data_structs import RedisDataStruct, RedisString
 
 from .database import RedisDatabase
-from .expiry import Expiry
+from .expiry import now_ms
 
 
 def rdb_parse(path: str) -> List[RedisDatabase]:
@@ -56,11 +56,11 @@ class _RdbParser:
 
     def _expiretimems(self) -> None:
         pxat = int.from_bytes(self._readexactly(8), 'little')
-        self._kvpair(Expiry.from_kwargs(pxat=pxat))
+        self._kvpair(pxat)
 
     def _expiretime(self) -> None:
         exat = int.from_bytes(self._readexactly(4), 'little')
-        self._kvpair(Expiry.from_kwargs(exat=exat))
+        self._kvpair(exat * 1000)
 
     def _selectdb(self) -> None:
         self._db_index = self._read_length()
@@ -68,12 +68,12 @@ class _RdbParser:
     def _eof(self) -> None:
         self._at_eof = True
 
-    def _kvpair(self, expiry: Optional[Expiry] = None) -> None:
+    def _kvpair(self, expiry: Optional[int] = None) -> None:
         value_type = ord(self._readexactly(1))
         key = self._read_string().to_bytes()
         value = self._read_value(value_type)
 
-        if expiry is None or not expiry.has_passed():
+        if expiry is None or expiry > now_ms():
             self._databases[self._db_index].set(key, value, expiry)
 
     def _read_length(self) -> int:
@@ -110,7 +110,7 @@ class _RdbParser:
                     raise RuntimeError('Unexpected LZF-compressed string')
                 case _:
                     raise RuntimeError(f'Unknown encoding format: {lsbs:06b}')
-            return RedisString(str(n).encode())
+            return RedisString(n)
 
         if msbs == 0b00:
             length = lsbs
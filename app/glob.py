@@ -0,0 +1,96 @@
+__all__ = ('GlobPattern', 'compile_glob')
+
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, List, Tuple
+
+
+_CACHE_SIZE = 1024
+
+
+@dataclass(frozen=True)
+class GlobPattern:
+    prefix: bytes
+    match: Callable[[bytes], bool]
+
+    @property
+    def matches_all(self) -> bool:
+        return self.match is _match_all
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def compile_glob(pattern: bytes) -> GlobPattern:
+    if pattern == b'*':
+        return GlobPattern(b'', _match_all)
+
+    parts: List[bytes] = []
+    literal = bytearray()
+    prefix = None
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i:i+1]
+        if c == b'\\' and i + 1 < n:
+            literal += pattern[i+1:i+2]
+            parts.append(re.escape(pattern[i+1:i+2]))
+            i += 2
+            continue
+
+        if c in (b'*', b'?', b'['):
+            if prefix is None:
+                prefix = bytes(literal)
+            if c == b'*':
+                parts.append(b'.*')
+                i += 1
+            elif c == b'?':
+                parts.append(b'.')
+                i += 1
+            else:
+                part, i = _compile_class(pattern, i + 1)
+                parts.append(part)
+            continue
+
+        literal += c
+        parts.append(re.escape(c))
+        i += 1
+
+    if prefix is None:
+        return GlobPattern(bytes(literal), bytes(literal).__eq__)
+
+    regex = re.compile(b''.join(parts), re.DOTALL)
+    return GlobPattern(prefix, lambda s: regex.fullmatch(s) is not None)
+
+
+def _compile_class(pattern: bytes, i: int) -> Tuple[bytes, int]:
+    negate = pattern[i:i+1] == b'^'
+    if negate:
+        i += 1
+
+    items: List[bytes] = []
+    n = len(pattern)
+    while i < n and pattern[i:i+1] != b']':
+        if pattern[i:i+1] == b'\\' and i + 1 < n:
+            items.append(_class_char(pattern[i+1]))
+            i += 2
+        elif i + 2 < n and pattern[i+1:i+2] == b'-' and pattern[i+2:i+3] != b']':
+            lo, hi = sorted((pattern[i], pattern[i+2]))
+            items.append(_class_char(lo) + b'-' + _class_char(hi))
+            i += 3
+        else:
+            items.append(_class_char(pattern[i]))
+            i += 1
+
+    if not items:
+        part = b'.' if negate else b'(?!)'
+    else:
+        part = b'[' + (b'^' if negate else b'') + b''.join(items) + b']'
+    return part, i + 1
+
+
+def _class_char(c: int) -> bytes:
+    return b'\\x%02x' % c
+
+
+def _match_all(s: bytes) -> bool:
+    return True
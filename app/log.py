@@ -0,0 +1,101 @@
+__all__ = ('VERBOSE', 'command_tracer', 'logger', 'setup_logging')
+
+
+import atexit
+import logging
+import logging.handlers
+import queue
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+
+VERBOSE = 15
+
+_LOG_LEVELS: Dict[str, int] = {
+    'debug': logging.DEBUG,
+    'verbose': VERBOSE,
+    'notice': logging.INFO,
+    'warning': logging.WARNING,
+}
+
+_MAX_TRACED_ARGS = 8
+_MAX_TRACED_ARG_LEN = 64
+
+logger = logging.getLogger('redis')
+
+logging.addLevelName(VERBOSE, 'VERBOSE')
+logging.addLevelName(logging.INFO, 'NOTICE')
+
+
+class _CommandTracer:
+    def __init__(self) -> None:
+        self.enabled = False
+        self._sample_every = 1
+        self._countdown = 1
+
+    def configure(self, enabled: bool, sample_every: int) -> None:
+        self.enabled = enabled
+        self._sample_every = max(sample_every, 1)
+        self._countdown = 1
+
+    def trace(self, addr: Tuple[str, int], args: List[bytes]) -> None:
+        self._countdown -= 1
+        if self._countdown > 0:
+            return
+
+        self._countdown = self._sample_every
+        logger.debug('Received command from %s: %s', addr, _ArgsSummary(args))
+
+
+command_tracer = _CommandTracer()
+
+
+class _ArgsSummary:
+    def __init__(self, args: List[bytes]) -> None:
+        self._args = args
+
+    def __str__(self) -> str:
+        summary = ' '.join(_abbreviate(arg) for arg in self._args[:_MAX_TRACED_ARGS])
+        if len(self._args) > _MAX_TRACED_ARGS:
+            summary += f' ... ({len(self._args) - _MAX_TRACED_ARGS} more)'
+        return summary
+
+
+def _abbreviate(arg: bytes) -> str:
+    if len(arg) <= _MAX_TRACED_ARG_LEN:
+        return repr(arg)
+    return f'{arg[:_MAX_TRACED_ARG_LEN]!r}...({len(arg)} bytes)'
+
+
+class _BackgroundQueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> Any:
+        return record
+
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def setup_logging(level: str = 'notice', sample_every: int = 1) -> None:
+    global _listener
+
+    if _listener is not None:
+        _listener.stop()
+
+    records: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(message)s'))
+
+    logger.handlers[:] = [_BackgroundQueueHandler(records)]
+    logger.setLevel(_LOG_LEVELS[level])
+    logger.propagate = False
+
+    _listener = logging.handlers.QueueListener(records, stream_handler)
+    _listener.start()
+
+    command_tracer.configure(logger.isEnabledFor(logging.DEBUG), sample_every)
+
+
+@atexit.register
+def _stop_listener() -> None:
+    if _listener is not None:
+        _listener.stop()
@@ -1,22 +1,52 @@
 import argparse
 import asyncio
 
+from .bigkeys import find_big_keys
+from .database import EVICTION_POLICIES
+from .log import setup_logging
 from .server import RedisServer, RedisServerConfig
 
 
 def parse_command_line_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser()
 
+    parser.add_argument('--bigkeys', action='store_true')
     parser.add_argument('--dbfilename', type=str, default='dump.rdb')
     parser.add_argument('--dir', type=str, default='./')
+    parser.add_argument('--engine', type=str, choices=('streams', 'protocol'), default='streams')
+    parser.add_argument('--hz', type=int, default=10)
+    parser.add_argument('--lazyfree-threshold', type=int, default=64)
+    parser.add_argument('--list-max-listpack-size', type=int, default=-2)
+    parser.add_argument('--loglevel', type=str, choices=('debug', 'verbose', 'notice', 'warning'), default='notice')
+    parser.add_argument('--logsample', type=int, default=1)
+    parser.add_argument('--maxmemory', type=_parse_memory, default=0)
+    parser.add_argument('--maxmemory-policy', type=str, choices=EVICTION_POLICIES, default='noeviction')
+    parser.add_argument('--maxmemory-samples', type=int, default=5)
+    parser.add_argument('--memkeys', action='store_true')
     parser.add_argument('--port', type=int, default=6379)
     parser.add_argument('--replicaof', type=str, default=None)
+    parser.add_argument('--tracking-table-max-keys', type=int, default=1_000_000)
+    parser.add_argument('--zset-max-listpack-entries', type=int, default=128)
+    parser.add_argument('--zset-max-listpack-value', type=int, default=64)
 
     return parser.parse_args()
 
 
+def _parse_memory(value: str) -> int:
+    value = value.lower()
+    for suffix, multiplier in _MEMORY_UNITS:
+        if value.endswith(suffix):
+            return int(value[:-len(suffix)]) * multiplier
+    return int(value)
+
+
 def main() -> None:
     args = parse_command_line_args()
+    if args.bigkeys or args.memkeys:
+        asyncio.run(find_big_keys('localhost', args.port, by_memory=args.memkeys))
+        return
+
+    setup_logging(args.loglevel, args.logsample)
 
     if args.replicaof is not None:
         master_host_str, master_port_str = args.replicaof.split(' ')
@@ -24,10 +54,32 @@ def main() -> None:
     else:
         master_addr = None
 
-    config = RedisServerConfig(dbfilename=args.dbfilename, dir=args.dir)
-    server = RedisServer(args.port, config, master_addr=master_addr)
+    config = RedisServerConfig(
+        dbfilename=args.dbfilename,
+        dir=args.dir,
+        hz=args.hz,
+        lazyfree_threshold=args.lazyfree_threshold,
+        maxmemory=args.maxmemory,
+        maxmemory_policy=args.maxmemory_policy,
+        maxmemory_samples=args.maxmemory_samples,
+        list_max_listpack_size=args.list_max_listpack_size,
+        tracking_table_max_keys=args.tracking_table_max_keys,
+        zset_max_listpack_entries=args.zset_max_listpack_entries,
+        zset_max_listpack_value=args.zset_max_listpack_value,
+    )
+    server = RedisServer(args.port, config, master_addr=master_addr, engine=args.engine)
     asyncio.run(server.run())
 
 
+_MEMORY_UNITS = (
+    ('kb', 1024),
+    ('mb', 1024 ** 2),
+    ('gb', 1024 ** 3),
+    ('k', 1000),
+    ('m', 1000 ** 2),
+    ('g', 1000 ** 3),
+)
+
+
 if __name__ == '__main__':
     main()
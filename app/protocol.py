@@ -1,24 +1,39 @@
 __all__ = (
+    'Buffer',
     'RespArray',
     'RespBulkString',
+    'RespEmptyArray',
     'RespInteger',
     'RespNullArray',
     'RespNullBulkString',
+    'RespOk',
+    'RespParser',
+    'RespPong',
+    'RespQueued',
     'RespSimpleError',
     'RespSimpleString',
     'RespValue',
     'resp_decode',
+    'resp_integer',
 )
 
 
 import asyncio
 from abc import ABC, abstractmethod
-from typing import Any, List, Union
+from typing import Any, List, Optional, Tuple, TypeAlias, Union
+
+
+Buffer: TypeAlias = Union[bytes, bytearray, memoryview]
 
 
 class RespValue(ABC):
-    @abstractmethod
     def encode(self) -> bytes:
+        segments: List[Buffer] = []
+        self.encode_into(segments)
+        return b''.join(segments)
+
+    @abstractmethod
+    def encode_into(self, segments: List[Buffer]) -> None:
         raise NotImplementedError
 
     @abstractmethod
@@ -29,9 +44,12 @@ class RespValue(ABC):
 class RespSimpleString(RespValue):
     def __init__(self, value: str) -> None:
         self._value = value
+        self._encoded: Optional[bytes] = None
 
-    def encode(self) -> bytes:
-        return f'+{self._value}\r\n'.encode()
+    def encode_into(self, segments: List[Buffer]) -> None:
+        if self._encoded is None:
+            self._encoded = f'+{self._value}\r\n'.encode()
+        segments.append(self._encoded)
 
     def to_builtin(self) -> str:
         return self._value
@@ -41,8 +59,8 @@ class RespSimpleError(RespValue):
     def __init__(self, message: str) -> None:
         self._message = message
 
-    def encode(self) -> bytes:
-        return f'-{self._message}\r\n'.encode()
+    def encode_into(self, segments: List[Buffer]) -> None:
+        segments.append(f'-{self._message}\r\n'.encode())
 
     def to_builtin(self) -> Exception:
         return Exception(self._message)
@@ -51,30 +69,33 @@ class RespSimpleError(RespValue):
 class RespInteger(RespValue):
     def __init__(self, value: int) -> None:
         self._value = value
+        self._encoded: Optional[bytes] = None
 
-    def encode(self) -> bytes:
-        return f':{self._value}\r\n'.encode()
+    def encode_into(self, segments: List[Buffer]) -> None:
+        if self._encoded is None:
+            self._encoded = b':%d\r\n' % self._value
+        segments.append(self._encoded)
 
     def to_builtin(self) -> int:
         return self._value
 
 
 class RespBulkString(RespValue):
-    def __init__(self, value: Union[bytes, str]) -> None:
+    def __init__(self, value: Union[Buffer, str]) -> None:
         if isinstance(value, str):
             value = value.encode()
         self._value = value
 
-    def encode(self) -> bytes:
-        return f'${len(self._value)}\r\n'.encode() + self._value + b'\r\n'
+    def encode_into(self, segments: List[Buffer]) -> None:
+        segments += (_bulk_string_header(len(self._value)), self._value, b'\r\n')
 
     def to_builtin(self) -> bytes:
-        return self._value
+        return bytes(self._value)
 
 
 class _RespNullBulkString(RespValue):
-    def encode(self) -> bytes:
-        return b'$-1\r\n'
+    def encode_into(self, segments: List[Buffer]) -> None:
+        segments.append(b'$-1\r\n')
 
     def to_builtin(self) -> None:
         return None
@@ -87,17 +108,18 @@ class RespArray(RespValue):
     def __init__(self, values: List[RespValue]) -> None:
         self._values = values
 
-    def encode(self) -> bytes:
-        encoded_values = b''.join(v.encode() for v in self._values)
-        return f'*{len(self._values)}\r\n'.encode() + encoded_values
+    def encode_into(self, segments: List[Buffer]) -> None:
+        segments.append(_array_header(len(self._values)))
+        for v in self._values:
+            v.encode_into(segments)
 
     def to_builtin(self) -> List[Any]:
         return [v.to_builtin() for v in self._values]
 
 
 class _RespNullArray(RespValue):
-    def encode(self) -> bytes:
-        return b'*-1\r\n'
+    def encode_into(self, segments: List[Buffer]) -> None:
+        segments.append(b'*-1\r\n')
 
     def to_builtin(self) -> None:
         return None
@@ -106,6 +128,38 @@ class _RespNullArray(RespValue):
 RespNullArray = _RespNullArray()
 
 
+RespOk = RespSimpleString('OK')
+RespPong = RespSimpleString('PONG')
+RespQueued = RespSimpleString('QUEUED')
+RespEmptyArray = RespArray([])
+
+_SHARED_INTEGERS_SIZE = 10001
+_SHARED_INTEGERS = tuple(RespInteger(n) for n in range(_SHARED_INTEGERS_SIZE))
+
+
+def resp_integer(value: int) -> RespInteger:
+    if 0 <= value < _SHARED_INTEGERS_SIZE:
+        return _SHARED_INTEGERS[value]
+    return RespInteger(value)
+
+
+_HEADER_CACHE_SIZE = 1024
+_BULK_STRING_HEADERS = tuple(b'$%d\r\n' % n for n in range(_HEADER_CACHE_SIZE))
+_ARRAY_HEADERS = tuple(b'*%d\r\n' % n for n in range(_HEADER_CACHE_SIZE))
+
+
+def _bulk_string_header(length: int) -> bytes:
+    if length < _HEADER_CACHE_SIZE:
+        return _BULK_STRING_HEADERS[length]
+    return b'$%d\r\n' % length
+
+
+def _array_header(length: int) -> bytes:
+    if length < _HEADER_CACHE_SIZE:
+        return _ARRAY_HEADERS[length]
+    return b'*%d\r\n' % length
+
+
 async def resp_decode(reader: asyncio.StreamReader) -> RespValue:
     b = await reader.readexactly(1)
 
@@ -137,3 +191,110 @@ async def resp_decode(reader: asyncio.StreamReader) -> RespValue:
             return RespArray(values)
 
     raise RuntimeError(f'Unexpected byte in RESP decoding: {b!r}')
+
+
+class RespParser:
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+        self._frames: List[Tuple[List[RespValue], int]] = []
+
+    def feed(self, data: bytes) -> None:
+        self._buffer += data
+
+    def parse(self) -> List[RespValue]:
+        values = []
+        pos = 0
+        with memoryview(self._buffer) as view:
+            while True:
+                value, pos = self._parse_value(view, pos)
+                if value is None:
+                    break
+                values.append(value)
+        del self._buffer[:pos]
+        return values
+
+    def parse_one(self) -> Optional[RespValue]:
+        with memoryview(self._buffer) as view:
+            value, pos = self._parse_value(view, 0)
+        del self._buffer[:pos]
+        return value
+
+    def parse_rdb(self) -> Optional[bytes]:
+        buf = self._buffer
+        end = buf.find(b'\r\n')
+        if end < 0:
+            return None
+
+        if buf[0] != _BULK_STRING:
+            raise RuntimeError(f'Unexpected byte in RDB transfer: {buf[:1]!r}')
+
+        start = end + 2
+        stop = start + int(buf[1:end])
+        if len(buf) < stop:
+            return None
+
+        rdb = bytes(buf[start:stop])
+        del buf[:stop]
+        return rdb
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def _parse_value(self, view: memoryview, pos: int) -> Tuple[Optional[RespValue], int]:
+        buf = self._buffer
+        size = len(buf)
+        frames = self._frames
+
+        while True:
+            end = buf.find(b'\r\n', pos)
+            if end < 0:
+                return None, pos
+
+            kind = buf[pos]
+            if kind == _BULK_STRING:
+                length = int(view[pos+1:end])
+                if length < 0:
+                    value, pos = RespNullBulkString, end + 2
+                else:
+                    start = end + 2
+                    stop = start + length
+                    if stop + 2 > size:
+                        return None, pos
+                    value, pos = RespBulkString(bytes(view[start:stop])), stop + 2
+
+            elif kind == _ARRAY:
+                length = int(view[pos+1:end])
+                pos = end + 2
+                if length > 0:
+                    frames.append(([], length))
+                    continue
+                value = RespNullArray if length < 0 else RespArray([])
+
+            elif kind == _SIMPLE_STRING:
+                value, pos = RespSimpleString(str(view[pos+1:end], 'utf-8')), end + 2
+
+            elif kind == _SIMPLE_ERROR:
+                value, pos = RespSimpleError(str(view[pos+1:end], 'utf-8')), end + 2
+
+            elif kind == _INTEGER:
+                value, pos = RespInteger(int(view[pos+1:end])), end + 2
+
+            else:
+                raise RuntimeError(f'Unexpected byte in RESP decoding: {bytes([kind])!r}')
+
+            while frames:
+                values, length = frames[-1]
+                values.append(value)
+                if len(values) < length:
+                    break
+                frames.pop()
+                value = RespArray(values)
+            else:
+                return value, pos
+
+
+_SIMPLE_STRING = ord('+')
+_SIMPLE_ERROR = ord('-')
+_INTEGER = ord(':')
+_BULK_STRING = ord('$')
+_ARRAY = ord('*')
@@ -1,30 +1,49 @@
 import asyncio
 import os
-from typing import List, Literal, Optional, Set, TypeAlias, Tuple
+import time
+from typing import Any, Coroutine, Generator, List, Literal, Optional, Set, TypeAlias, Tuple
 
 from .args_parser import parse_args_to_command
 from .channel import has_subbed
 from .commands import (
+    DelCommand,
     DiscardCommand,
     ExecCommand,
     MultiCommand,
     PingCommand,
+    PsubscribeCommand,
     PsyncCommand,
+    PunsubscribeCommand,
     RedisCommand,
     ReplconfCommand,
     SubscribeCommand,
     UnsubscribeCommand,
 )
-from .connection import RedisConnection
-from .database import RedisDatabase, rdb_parse
+from .connection import RedisConnection, RedisProtocolConnection, RedisStreamConnection
+from .data_structs import set_listpack_limits
+from .database import LazyFreer, RedisDatabase, rdb_parse
+from .log import VERBOSE, command_tracer, logger
 from .protocol import *
+from .tracking import TrackingTable
 
 
 class RedisServerConfig:
-    def __init__(self, dbfilename: str = 'dump.rdb', dir: str = './') -> None:
+    def __init__(self, dbfilename: str = 'dump.rdb', dir: str = './', hz: int = 10, lazyfree_threshold: int = 64,
+                 maxmemory: int = 0, maxmemory_policy: str = 'noeviction', maxmemory_samples: int = 5,
+                 list_max_listpack_size: int = -2, tracking_table_max_keys: int = 1_000_000,
+                 zset_max_listpack_entries: int = 128, zset_max_listpack_value: int = 64) -> None:
         self._params = {
             'dbfilename': dbfilename,
             'dir': dir,
+            'hz': str(min(max(hz, _HZ_MIN), _HZ_MAX)),
+            'lazyfree-threshold': str(lazyfree_threshold),
+            'list-max-listpack-size': str(list_max_listpack_size),
+            'maxmemory': str(maxmemory),
+            'maxmemory-policy': maxmemory_policy,
+            'maxmemory-samples': str(maxmemory_samples),
+            'tracking-table-max-keys': str(tracking_table_max_keys),
+            'zset-max-listpack-entries': str(zset_max_listpack_entries),
+            'zset-max-listpack-value': str(zset_max_listpack_value),
         }
 
     def get(self, param: str) -> Optional[str]:
@@ -32,35 +51,59 @@ class RedisServerConfig:
 
 
 _Address: TypeAlias = Tuple[str, int]
+_Engine: TypeAlias = Literal['streams', 'protocol']
 
 
 class RedisServer:
-    def __init__(self, port: int, config: RedisServerConfig, master_addr: Optional[_Address] = None) -> None:
+    def __init__(self, port: int, config: RedisServerConfig, master_addr: Optional[_Address] = None, engine: _Engine = 'streams') -> None:
         self._port = port
         self._config = config
         self._master_addr = master_addr
+        self._engine = engine
         self._master = None
         self._replicas: Set[RedisConnection] = set()
         self._replication_offset = 0
         self._target_replication_offset = 0
+        self._expire_cycle_time_us = 0
+        self._expire_cycle_last_us = 0
+        self._evicted_keys = 0
+        self._maxmemory = int(config.get('maxmemory'))
+        self._maxmemory_policy = config.get('maxmemory-policy')
+        self._maxmemory_samples = int(config.get('maxmemory-samples'))
+        self._lazyfree = LazyFreer(int(config.get('lazyfree-threshold')))
+        self._tracking = TrackingTable(int(config.get('tracking-table-max-keys')))
 
     def get_database(self, db_index: int) -> RedisDatabase:
         return self._databases[db_index]
 
     async def run(self) -> None:
+        set_listpack_limits(
+            list_max_size=int(self._config.get('list-max-listpack-size')),
+            zset_max_entries=int(self._config.get('zset-max-listpack-entries')),
+            zset_max_value=int(self._config.get('zset-max-listpack-value')),
+        )
         self._databases = self._load_databases()
+        for db in self._databases:
+            db.set_eviction_policy(self._maxmemory_policy)
+            db.set_lazyfree(self._lazyfree)
+            db.set_tracking(self._tracking)
 
-        server = await asyncio.start_server(self._client_connected_cb, 'localhost', self._port, reuse_port=True)
+        if self._engine == 'protocol':
+            server = await asyncio.get_running_loop().create_server(
+                lambda: RedisProtocolConnection(self, self._serve_buffered, self._connection_closed), 'localhost', self._port, reuse_port=True)
+        else:
+            server = await asyncio.start_server(self._client_connected_cb, 'localhost', self._port, reuse_port=True)
 
         async with server, asyncio.TaskGroup() as tg:
             if self._master_addr is not None:
                 master_host, master_port = self._master_addr
                 reader, writer = await asyncio.open_connection(master_host, master_port)
-                self._master = RedisConnection(reader, writer, server=self)
+                self._master = RedisStreamConnection(reader, writer, server=self)
                 await self._handshake_with_master()
                 tg.create_task(self._handle_connection(self._master))
 
             tg.create_task(server.serve_forever())
+            tg.create_task(self._active_expire_cycle())
 
     async def wait(self, num_replicas: int, timeout_ms: int) -> int:
         replconf = ReplconfCommand(args=['GETACK', '*'])
@@ -93,6 +136,42 @@ class RedisServer:
     def config(self) -> RedisServerConfig:
         return self._config
 
+    @property
+    def expire_cycle_last_us(self) -> int:
+        return self._expire_cycle_last_us
+
+    @property
+    def expire_cycle_time_us(self) -> int:
+        return self._expire_cycle_time_us
+
+    @property
+    def databases(self) -> List[RedisDatabase]:
+        return self._databases
+
+    @property
+    def evicted_keys(self) -> int:
+        return self._evicted_keys
+
+    @property
+    def expired_keys(self) -> int:
+        return sum(db.expired_keys for db in self._databases)
+
+    @property
+    def lazyfree_pending_objects(self) -> int:
+        return self._lazyfree.pending_objects
+
+    @property
+    def lazyfreed_objects(self) -> int:
+        return self._lazyfree.freed_objects
+
+    @property
+    def maxmemory(self) -> int:
+        return self._maxmemory
+
+    @property
+    def maxmemory_policy(self) -> str:
+        return self._maxmemory_policy
+
     @property
     def replication_id(self) -> str:
         return '8371b4fb1155b71f4a04d3e1bc3e18c4a990aeeb'
@@ -105,48 +184,145 @@ class RedisServer:
     def role(self) -> Literal['master', 'slave']:
         return 'master' if self._master_addr is None else 'slave'
 
+    @property
+    def tracking(self) -> TrackingTable:
+        return self._tracking
+
+    @property
+    def used_memory(self) -> int:
+        return sum(db.used_memory for db in self._databases)
+
+    async def _active_expire_cycle(self) -> None:
+        period = 1 / int(self._config.get('hz'))
+        while True:
+            start = time.perf_counter()
+            deadline = start + period * _EXPIRE_CYCLE_BUDGET
+
+            done = True
+            for db in self._databases:
+                done = db.expire_cycle(deadline) and done
+            if self._tracking.has_pending:
+                self._tracking.send_invalidations()
+
+            elapsed_us = int((time.perf_counter() - start) * 1_000_000)
+            self._expire_cycle_last_us = elapsed_us
+            self._expire_cycle_time_us += elapsed_us
+
+            await asyncio.sleep(period if done else _EXPIRE_CYCLE_FAST_DELAY)
+
     async def _client_connected_cb(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
-        await self._handle_connection(RedisConnection(reader, writer, server=self))
+        await self._handle_connection(RedisStreamConnection(reader, writer, server=self))
+
+    def _connection_closed(self, conn: RedisConnection) -> None:
+        self._tracking.disable(conn)
 
     async def _execute(self, conn: RedisConnection, command: RedisCommand) -> RespValue:
-        if has_subbed(conn) and not isinstance(command, (PingCommand, SubscribeCommand, UnsubscribeCommand)):
+        if has_subbed(conn) and not isinstance(command, (PingCommand, PsubscribeCommand, PunsubscribeCommand, SubscribeCommand, UnsubscribeCommand)):
             return RespSimpleError(f'ERR Can\'t execute \'{command.__class__.__name__[:-7]}\'')
 
+        if self._maxmemory and conn is not self._master and command.is_denyoom() and not self._perform_evictions():
+            return RespSimpleError('OOM command not allowed when used memory > \'maxmemory\'.')
+
         if conn.transaction.active and not isinstance(command, (DiscardCommand, ExecCommand, MultiCommand)):
             conn.transaction.enqueue(command)
-            return RespSimpleString('QUEUED')
+            return RespQueued
 
-        return await command.execute(conn)
+        self._tracking.begin_command(conn, read_only=command.is_read_only())
+        try:
+            return await command.execute(conn)
+        finally:
+            self._tracking.end_command()
+
+    async def _flush(self, conn: RedisConnection) -> None:
+        await conn.flush()
+        for replica in self._replicas:
+            await replica.flush()
+
+    async def _handle_command(self, conn: RedisConnection, command: RedisCommand) -> bool:
+        response = await self._execute(conn, command)
+
+        if conn is not self._master or (isinstance(command, ReplconfCommand) and command.args[0] == 'GETACK'):
+            conn.send_resp(response)
+
+        if command.is_write_command():
+            self._propagate_command(command)
+
+        if self._tracking.has_pending:
+            self._tracking.send_invalidations()
+
+        if isinstance(command, PsyncCommand):
+            empty_rdb = bytes.fromhex(
+                '524544495330303131fa0972656469732d76657205372e322e30fa0a72656469732d62697473c040fa056374696d65c26d08bc65fa08757365642d6d656dc2b0c41000fa08616f662d62617365c000fff06e3bfec0ff5aa2')
+            conn.send(f'${len(empty_rdb)}\r\n'.encode() + empty_rdb)
+            await self._flush(conn)
+            self._replicas.add(conn)
+            return False
+
+        if conn is self._master:
+            self._replication_offset += len(command.to_resp_array().encode())
+
+        return True
 
     async def _handle_connection(self, conn: RedisConnection) -> None:
-        print(f'Accepted connection from {conn.addr}')
+        logger.log(VERBOSE, 'Accepted connection from %s', conn.addr)
 
         try:
             while True:
-                args = await conn.read_args()
-                command = parse_args_to_command(args)
-                print(f'Received command from {conn.addr}: {command!r}')
+                for args in await conn.read_batch():
+                    if command_tracer.enabled:
+                        command_tracer.trace(conn.addr, args)
+                    command = parse_args_to_command(args)
+
+                    if command.is_blocking():
+                        await self._flush(conn)
 
-                response = await self._execute(conn, command)
+                    if not await self._handle_command(conn, command):
+                        return
 
-                if conn is not self._master or (isinstance(command, ReplconfCommand) and command.args[0] == 'GETACK'):
-                    await conn.write_resp(response)
+                await self._flush(conn)
 
-                if command.is_write_command():
-                    await self._propagate_command(command)
+        except asyncio.IncompleteReadError:
+            await conn.close()
+        finally:
+            self._connection_closed(conn)
 
-                if isinstance(command, PsyncCommand):
-                    empty_rdb = bytes.fromhex(
-                        '524544495330303131fa0972656469732d76657205372e322e30fa0a72656469732d62697473c040fa056374696d65c26d08bc65fa08757365642d6d656dc2b0c41000fa08616f662d62617365c000fff06e3bfec0ff5aa2')
-                    await conn.write(f'${len(empty_rdb)}\r\n'.encode() + empty_rdb)
-                    self._replicas.add(conn)
+    def _serve_buffered(self, conn: RedisProtocolConnection) -> None:
+        if conn in self._replicas:
+            return
+
+        try:
+            while (args := conn.next_args()) is not None:
+                if command_tracer.enabled:
+                    command_tracer.trace(conn.addr, args)
+                command = parse_args_to_command(args)
+
+                if command.is_blocking() or isinstance(command, ExecCommand):
+                    self._flush_nowait(conn)
+                    conn.run_in_task(self._handle_command(conn, command))
                     return
 
-                if conn is self._master:
-                    self._replication_offset += len(command.to_resp_array().encode())
+                coro = self._handle_command(conn, command)
+                try:
+                    yielded = coro.send(None)
+                except StopIteration as stop:
+                    if not stop.value:
+                        return
+                    continue
 
-        except asyncio.IncompleteReadError:
-            await conn.close()
+                conn.run_in_task(_resume(coro, yielded))
+                return
+
+        except Exception as exc:
+            logger.log(VERBOSE, 'Closed connection from %s due to %r', conn.addr, exc)
+            conn.close_nowait()
+            return
+
+        self._flush_nowait(conn)
+
+    def _flush_nowait(self, conn: RedisProtocolConnection) -> None:
+        conn.flush_nowait()
+        for replica in self._replicas:
+            replica.flush_nowait()
 
     async def _handshake_with_master(self) -> None:
         ping = PingCommand()
@@ -174,8 +350,64 @@ class RedisServer:
         except FileNotFoundError:
             return [RedisDatabase() for _ in range(16)]
 
-    async def _propagate_command(self, command: RedisCommand) -> None:
+    def _perform_evictions(self) -> bool:
+        while self.used_memory > self._maxmemory:
+            if self._maxmemory_policy == 'noeviction':
+                return False
+
+            best = None
+            for db in self._databases:
+                candidate = db.eviction_candidate(self._maxmemory_policy, self._maxmemory_samples)
+                if candidate is not None and (best is None or candidate[0] > best[0]):
+                    best = candidate[0], candidate[1], db
+
+            if best is None:
+                return False
+
+            _, key, db = best
+            db.delete(key)
+            self._propagate_command(DelCommand(keys=[key]))
+            self._evicted_keys += 1
+
+        return True
+
+    def _propagate_command(self, command: RedisCommand) -> None:
         data = command.to_resp_array().encode()
         for replica in self._replicas:
-            await replica.write(data)
+            replica.send(data)
         self._target_replication_offset += len(data)
+
+
+_EXPIRE_CYCLE_BUDGET = 0.25
+_HZ_MIN = 1
+_HZ_MAX = 500
+_EXPIRE_CYCLE_FAST_DELAY = 0.001
+
+
+class _Suspended:
+    def __init__(self, coro: Coroutine[Any, Any, Any], yielded: Any) -> None:
+        self._coro = coro
+        self._yielded = yielded
+
+    def __await__(self) -> Generator[Any, Any, Any]:
+        coro, yielded = self._coro, self._yielded
+        while True:
+            try:
+                sent = yield yielded
+            except GeneratorExit:
+                coro.close()
+                raise
+            except BaseException as exc:
+                try:
+                    yielded = coro.throw(exc)
+                except StopIteration as stop:
+                    return stop.value
+            else:
+                try:
+                    yielded = coro.send(sent)
+                except StopIteration as stop:
+                    return stop.value
+
+
+async def _resume(coro: Coroutine[Any, Any, Any], yielded: Any) -> Any:
+    return await _Suspended(coro, yielded)
@@ -0,0 +1,169 @@
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set
+
+from .channel import send_message
+from .connection import RedisConnection
+from .protocol import RespArray, RespBulkString, RespNullArray
+
+
+@dataclass(eq=False)
+class _TrackingClient:
+    target: RedisConnection
+    bcast: bool = False
+    optin: bool = False
+    optout: bool = False
+    prefixes: List[bytes] = field(default_factory=list)
+    keys: Set[bytes] = field(default_factory=set)
+    caching: Optional[bool] = None
+    command_caching: Optional[bool] = None
+
+
+class TrackingTable:
+    def __init__(self, max_keys: int = 1_000_000) -> None:
+        self.max_keys = max_keys
+        self._clients: Dict[RedisConnection, _TrackingClient] = {}
+        self._keys: OrderedDict[bytes, Set[RedisConnection]] = OrderedDict()
+        self._prefixes: Dict[bytes, Set[RedisConnection]] = defaultdict(set)
+        self._pending: Dict[RedisConnection, Optional[Dict[bytes, None]]] = {}
+        self._reader: Optional[RedisConnection] = None
+
+    def begin_command(self, conn: RedisConnection, read_only: bool) -> None:
+        self._reader = None
+        client = self._clients.get(conn)
+        if client is None:
+            return
+
+        if not conn.transaction.executing:
+            client.command_caching, client.caching = client.caching, None
+        if not read_only or client.bcast:
+            return
+
+        caching = client.command_caching
+        if client.optin:
+            tracked = caching is True
+        else:
+            tracked = not client.optout or caching is not False
+        if tracked:
+            self._reader = conn
+
+    def disable(self, conn: RedisConnection) -> None:
+        client = self._clients.pop(conn, None)
+        if client is None:
+            return
+
+        for prefix in client.prefixes:
+            conns = self._prefixes[prefix]
+            conns.discard(conn)
+            if not conns:
+                del self._prefixes[prefix]
+
+        for key in client.keys:
+            conns = self._keys.get(key)
+            if conns is not None:
+                conns.discard(conn)
+                if not conns:
+                    del self._keys[key]
+
+    def enable(self, conn: RedisConnection, target: RedisConnection, *, bcast: bool = False, prefixes: List[bytes] = (),
+               optin: bool = False, optout: bool = False) -> None:
+        self.disable(conn)
+
+        prefixes = (list(prefixes) or [b'']) if bcast else []
+        self._clients[conn] = _TrackingClient(target, bcast, optin, optout, prefixes)
+        for prefix in prefixes:
+            self._prefixes[prefix].add(conn)
+
+    def end_command(self) -> None:
+        self._reader = None
+
+    @property
+    def has_pending(self) -> bool:
+        return bool(self._pending)
+
+    def invalidate(self, key: bytes) -> None:
+        conns = self._keys.pop(key, None)
+        if conns is not None:
+            self._queue_all(conns, key)
+
+        for prefix, conns in self._prefixes.items():
+            if key.startswith(prefix):
+                for conn in conns:
+                    self._queue(conn, key)
+
+    def invalidate_all(self) -> None:
+        self._keys.clear()
+        for client in self._clients.values():
+            client.keys.clear()
+            self._pending[client.target] = None
+
+    @property
+    def num_clients(self) -> int:
+        return len(self._clients)
+
+    @property
+    def num_keys(self) -> int:
+        return len(self._keys)
+
+    @property
+    def num_prefixes(self) -> int:
+        return len(self._prefixes)
+
+    def on_read(self, key: bytes) -> None:
+        conn = self._reader
+        if conn is None:
+            return
+
+        conns = self._keys.get(key)
+        if conns is None:
+            if self.max_keys and len(self._keys) >= self.max_keys:
+                self._evict()
+            conns = self._keys[key] = set()
+        conns.add(conn)
+        self._clients[conn].keys.add(key)
+
+    def set_caching(self, conn: RedisConnection, caching: bool) -> bool:
+        client = self._clients.get(conn)
+        if client is None or not (client.optout if caching is False else client.optin):
+            return False
+
+        if conn.transaction.executing:
+            client.command_caching = caching
+        else:
+            client.caching = caching
+        return True
+
+    def send_invalidations(self) -> None:
+        pending, self._pending = self._pending, {}
+        for target, keys in pending.items():
+            if target.closed:
+                continue
+
+            message = RespNullArray if keys is None else RespArray([RespBulkString(key) for key in keys])
+            try:
+                send_message(target, _INVALIDATE_CHANNEL, message)
+            except ConnectionError:
+                continue
+
+    def _evict(self) -> None:
+        key, conns = self._keys.popitem(last=False)
+        self._queue_all(conns, key)
+
+    def _queue(self, conn: RedisConnection, key: bytes) -> None:
+        client = self._clients.get(conn)
+        if client is None:
+            return
+
+        keys = self._pending.setdefault(client.target, {})
+        if keys is not None:
+            keys[key] = None
+
+    def _queue_all(self, conns: Set[RedisConnection], key: bytes) -> None:
+        for conn in conns:
+            client = self._clients.get(conn)
+            if client is not None:
+                client.keys.discard(key)
+            self._queue(conn, key)
+
+
+_INVALIDATE_CHANNEL = '__redis__:invalidate'
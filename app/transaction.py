@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING, List
 
-from .protocol import RespArray
+from .protocol import RespArray, RespValue
 
 if TYPE_CHECKING:
     from .commands import RedisCommand
@@ -11,6 +11,7 @@ class RedisTransaction:
     def __init__(self, conn: 'RedisConnection') -> None:
         self._conn = conn
         self._active = False
+        self._executing = False
         self._commands: List['RedisCommand'] = []
 
     def discard(self) -> None:
@@ -26,8 +27,13 @@ class RedisTransaction:
     async def execute(self) -> RespArray:
         if not self._active:
             raise RuntimeError
-        responses = [await command.execute(self._conn) for command in self._commands]
-        self._active = False
+        self._executing = True
+        try:
+            responses = [await self._execute(command) for command in self._commands]
+        finally:
+            self._executing = False
+            self._active = False
+            self._commands.clear()
         return RespArray(responses)
 
     def start(self) -> None:
@@ -39,3 +45,15 @@ class RedisTransaction:
     @property
     def active(self) -> bool:
         return self._active
+
+    @property
+    def executing(self) -> bool:
+        return self._executing
+
+    async def _execute(self, command: 'RedisCommand') -> RespValue:
+        tracking = self._conn.server.tracking
+        tracking.begin_command(self._conn, read_only=command.is_read_only())
+        try:
+            return await command.execute(self._conn)
+        finally:
+            tracking.end_command()
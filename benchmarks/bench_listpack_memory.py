@@ -0,0 +1,65 @@
+import argparse
+import gc
+import time
+import tracemalloc
+from typing import Callable, List, Union
+
+from app.data_structs import RedisList, RedisSortedSet, set_listpack_limits
+
+
+_Collection = Union[RedisList, RedisSortedSet]
+
+
+def _make_lists(num_keys: int, size: int) -> List[_Collection]:
+    lists = []
+    for i in range(num_keys):
+        lst = RedisList()
+        lst.rpush([f'item:{i}:{j}'.encode() for j in range(size)])
+        lists.append(lst)
+    return lists
+
+
+def _make_zsets(num_keys: int, size: int) -> List[_Collection]:
+    zsets = []
+    for i in range(num_keys):
+        zset = RedisSortedSet()
+        zset.add([(float(j), f'member:{i}:{j}'.encode()) for j in range(size)])
+        zsets.append(zset)
+    return zsets
+
+
+def _measure(name: str, make: Callable[[int, int], List[_Collection]], num_keys: int, size: int, packed: bool) -> int:
+    limit = 1 << 30 if packed else 0
+    set_listpack_limits(list_max_size=limit, zset_max_entries=limit, zset_max_value=limit)
+
+    start = time.perf_counter()
+    make(num_keys, size)
+    elapsed = time.perf_counter() - start
+
+    gc.collect()
+    tracemalloc.start()
+    collections = make(num_keys, size)
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    encoding = collections[0].encoding
+    reported = sum(c.nbytes for c in collections)
+    print(f'{name:<6} {encoding:<10} {allocated / num_keys:10,.0f} B/key (traced)  '
+          f'{reported / num_keys:10,.0f} B/key (reported)  {elapsed * 1000:8.1f} ms build')
+    return allocated
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--keys', type=int, default=5_000)
+    parser.add_argument('--size', type=int, default=32)
+    args = parser.parse_args()
+
+    for name, make in (('list', _make_lists), ('zset', _make_zsets)):
+        full = _measure(name, make, args.keys, args.size, packed=False)
+        packed = _measure(name, make, args.keys, args.size, packed=True)
+        print(f'{name:<6} memory saved: {1 - packed / full:.0%}')
+
+
+if __name__ == '__main__':
+    main()
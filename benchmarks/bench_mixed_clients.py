@@ -0,0 +1,133 @@
+import argparse
+import asyncio
+import subprocess
+import sys
+import time
+from typing import List, Optional
+
+from app.protocol import RespArray, RespBulkString, RespParser, RespValue
+
+
+class _Client:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._reader = reader
+        self._writer = writer
+        self._parser = RespParser()
+        self._replies: List[RespValue] = []
+
+    @classmethod
+    async def connect(cls, port: int) -> '_Client':
+        reader, writer = await asyncio.open_connection('localhost', port)
+        return cls(reader, writer)
+
+    async def call(self, *commands: List[str]) -> List[RespValue]:
+        self._writer.write(b''.join(_encode(command) for command in commands))
+        await self._writer.drain()
+
+        while len(self._replies) < len(commands):
+            data = await self._reader.read(64 * 1024)
+            if not data:
+                raise ConnectionError('server closed the connection')
+            self._parser.feed(data)
+            self._replies += self._parser.parse()
+
+        replies, self._replies = self._replies[:len(commands)], self._replies[len(commands):]
+        return replies
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+def _encode(command: List[str]) -> bytes:
+    return RespArray([RespBulkString(arg) for arg in command]).encode()
+
+
+async def _getset_client(port: int, index: int, depth: int, deadline: float) -> int:
+    client = await _Client.connect(port)
+    key = f'bench:key:{index}'
+    batch = [['SET', key, 'value'], ['GET', key]] * (depth // 2)
+
+    ops = 0
+    while time.perf_counter() < deadline:
+        await client.call(*batch)
+        ops += len(batch)
+
+    client.close()
+    return ops
+
+
+async def _blpop_client(port: int, deadline: float) -> int:
+    client = await _Client.connect(port)
+
+    pops = 0
+    while time.perf_counter() < deadline:
+        reply, = await client.call(['BLPOP', 'bench:jobs', '0.1'])
+        if reply.to_builtin() is not None:
+            pops += 1
+
+    client.close()
+    return pops
+
+
+async def _pusher(port: int, batch_size: int, deadline: float) -> int:
+    client = await _Client.connect(port)
+    jobs = [f'job:{i}' for i in range(batch_size)]
+
+    pushes = 0
+    while time.perf_counter() < deadline:
+        await client.call(['RPUSH', 'bench:jobs', *jobs])
+        pushes += batch_size
+        await asyncio.sleep(0)
+
+    client.close()
+    return pushes
+
+
+async def _run(args: argparse.Namespace) -> None:
+    deadline = time.perf_counter() + args.duration
+
+    getset = [_getset_client(args.port, i, args.depth, deadline) for i in range(args.getset_clients)]
+    blpop = [_blpop_client(args.port, deadline) for _ in range(args.blpop_clients)]
+    pushers = [_pusher(args.port, args.push_batch, deadline) for _ in range(args.pushers)]
+
+    results = await asyncio.gather(asyncio.gather(*getset), asyncio.gather(*blpop), asyncio.gather(*pushers))
+    getset_ops, pops, pushes = (sum(r) for r in results)
+
+    print(f'GET/SET: {getset_ops / args.duration:12,.0f} ops/s')
+    print(f'BLPOP:   {pops / args.duration:12,.0f} pops/s')
+    print(f'RPUSH:   {pushes / args.duration:12,.0f} elements/s')
+
+
+def _spawn_server(port: int, engine: str) -> subprocess.Popen:
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'app.main', '--port', str(port), '--engine', engine, '--dir', '/nonexistent'],
+        stdout=subprocess.DEVNULL,
+    )
+    time.sleep(1.0)
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--port', type=int, default=6390)
+    parser.add_argument('--engine', type=str, choices=('streams', 'protocol'), default='streams')
+    parser.add_argument('--no-spawn', action='store_true')
+    parser.add_argument('--duration', type=float, default=5.0)
+    parser.add_argument('--getset-clients', type=int, default=8)
+    parser.add_argument('--depth', type=int, default=16)
+    parser.add_argument('--blpop-clients', type=int, default=16)
+    parser.add_argument('--pushers', type=int, default=1)
+    parser.add_argument('--push-batch', type=int, default=16)
+    args = parser.parse_args()
+
+    server: Optional[subprocess.Popen] = None if args.no_spawn else _spawn_server(args.port, args.engine)
+    try:
+        asyncio.run(_run(args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+import argparse
+import asyncio
+import time
+from typing import Callable, List
+
+from app.protocol import RespArray, RespBulkString, RespParser, resp_decode
+
+
+def _make_payload(num_commands: int, value_size: int) -> bytes:
+    command = RespArray([
+        RespBulkString('SET'),
+        RespBulkString('key:000000'),
+        RespBulkString(b'x' * value_size),
+    ])
+    return command.encode() * num_commands
+
+
+def _chunks(payload: bytes, chunk_size: int) -> List[bytes]:
+    return [payload[i:i+chunk_size] for i in range(0, len(payload), chunk_size)]
+
+
+async def _run_resp_decode(chunks: List[bytes], num_commands: int) -> None:
+    reader = asyncio.StreamReader()
+    for chunk in chunks:
+        reader.feed_data(chunk)
+    reader.feed_eof()
+    for _ in range(num_commands):
+        (await resp_decode(reader)).to_builtin()
+
+
+async def _run_resp_parser(chunks: List[bytes], num_commands: int) -> None:
+    parser = RespParser()
+    parsed = 0
+    for chunk in chunks:
+        parser.feed(chunk)
+        for value in parser.parse():
+            value.to_builtin()
+            parsed += 1
+    assert parsed == num_commands
+
+
+def _measure(name: str, run: Callable, chunks: List[bytes], num_commands: int, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        asyncio.run(run(chunks, num_commands))
+        best = min(best, time.perf_counter() - start)
+    print(f'{name:<12} {best * 1000:8.1f} ms  {num_commands / best:12,.0f} commands/s')
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--commands', type=int, default=100_000)
+    parser.add_argument('--value-size', type=int, default=16)
+    parser.add_argument('--chunk-size', type=int, default=64 * 1024)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    chunks = _chunks(_make_payload(args.commands, args.value_size), args.chunk_size)
+    old = _measure('resp_decode', _run_resp_decode, chunks, args.commands, args.repeat)
+    new = _measure('RespParser', _run_resp_parser, chunks, args.commands, args.repeat)
+    print(f'speedup: {old / new:.2f}x')
+
+
+if __name__ == '__main__':
+    main()